@@ -1,11 +1,16 @@
 "\"\"\"Streamlit Application for International Student Survey Analysis\"\"\""
 
+import hashlib
 import os
+import re
 from io import BytesIO
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 import streamlit as st
 
 from data_processor import SurveyDataProcessor
@@ -13,6 +18,7 @@ from calculations import (
     calculate_country_counts,
     calculate_percentage_summary,
     calculate_nationality_percentage,
+    calculate_question_counts,
 )
 from comparisons import (
     compare_side_by_side,
@@ -22,6 +28,9 @@ from comparisons import (
 
 
 SAMPLE_FILE = "Assimilation into British University academic culture.csv"
+MAX_CHART_VALUES = 8
+# Label for folded minor values; distinct from a real "Other" survey answer
+OTHER_LABEL = "Other (grouped)"
 
 st.set_page_config(
     page_title="International Student Survey Explorer",
@@ -36,8 +45,12 @@ st.caption(
 )
 
 
+@st.cache_data(show_spinner=False)
 def process_data(uploaded_file: Optional[BytesIO], use_sample: bool) -> Optional[SurveyDataProcessor]:
-    """Load and process data via SurveyDataProcessor."""
+    """Load and process data via SurveyDataProcessor (cached per file contents).
+
+    st.cache_data hands every caller its own copy, so sessions never share a processor.
+    """
     processor = SurveyDataProcessor()
     success = False
 
@@ -52,6 +65,40 @@ def process_data(uploaded_file: Optional[BytesIO], use_sample: bool) -> Optional
     return None
 
 
+def get_session_processor(uploaded_file: Optional[BytesIO], use_sample: bool) -> Optional[SurveyDataProcessor]:
+    """Return this session's processor, reloading it only when the data source changes."""
+    if uploaded_file is not None:
+        source = ("upload", hashlib.sha1(uploaded_file.getvalue()).hexdigest())
+    else:
+        source = ("sample", use_sample)
+
+    if st.session_state.get("processor_source") != source:
+        st.session_state["processor"] = process_data(uploaded_file, use_sample)
+        st.session_state["processor_source"] = source
+    return st.session_state["processor"]
+
+
+# Branches are tried in order at the start of the name, so earlier categories win
+# regardless of where their keyword appears in the column name.
+QUESTION_CATEGORY_PATTERN = re.compile(
+    r"^(?:"
+    r"(?P<importance>(?=.*important))"
+    r"|(?P<agreement>(?=.*(?:agree|included)))"
+    r"|(?P<difficulty>(?=.*difficult))"
+    r"|(?P<english>(?=.*english language ability))"
+    r"|(?P<background>(?=.*(?:programme|institution|language)))"
+    r")",
+    re.IGNORECASE | re.DOTALL,
+)
+QUESTION_CATEGORY_NAMES = {
+    "importance": "Importance Factors",
+    "agreement": "Agreement & Inclusion",
+    "difficulty": "Difficulty Ratings",
+    "english": "English Proficiency",
+    "background": "Programme & Background",
+}
+
+
 def categorize_questions(columns: List[str]) -> Dict[str, List[str]]:
     """Group survey columns into friendly categories."""
     categories: Dict[str, List[str]] = {
@@ -64,26 +111,143 @@ def categorize_questions(columns: List[str]) -> Dict[str, List[str]]:
     }
 
     for col in columns:
-        col_lower = col.lower()
-        if "important" in col_lower:
-            categories["Importance Factors"].append(col)
-        elif "agree" in col_lower or "included" in col_lower:
-            categories["Agreement & Inclusion"].append(col)
-        elif "difficult" in col_lower:
-            categories["Difficulty Ratings"].append(col)
-        elif "english language ability" in col_lower:
-            categories["English Proficiency"].append(col)
-        elif any(keyword in col_lower for keyword in ["programme", "institution", "language"]):
-            categories["Programme & Background"].append(col)
-        else:
-            categories["Other"].append(col)
+        match = QUESTION_CATEGORY_PATTERN.match(col)
+        category = QUESTION_CATEGORY_NAMES[match.lastgroup] if match else "Other"
+        categories[category].append(col)
 
     # Remove empty categories
     return {k: v for k, v in categories.items() if v}
 
 
+def group_minor_values(by_country: pd.DataFrame, max_values: int = MAX_CHART_VALUES) -> pd.DataFrame:
+    """Keep the most common response values and fold the rest into OTHER_LABEL per nationality."""
+    value_totals = by_country.groupby("Value", observed=True)["Count"].sum()
+    if len(value_totals) <= max_values:
+        return by_country
+
+    top_values = value_totals.nlargest(max_values).index
+    # Kept values keep their original type; only values outside top_values are relabelled
+    values = by_country["Value"].astype(object).where(by_country["Value"].isin(top_values), OTHER_LABEL)
+    return (
+        by_country.assign(Value=values)
+        .groupby(["Nationality", "Value"], observed=True, sort=False)[["Count", "Percentage"]]
+        .sum()
+        .reset_index()
+    )
+
+
+def build_stacked_bar(by_country: pd.DataFrame, title: str) -> go.Figure:
+    """Stacked percentage bars, one trace per response value."""
+    chart_data = group_minor_values(by_country)
+    value_order = chart_data.groupby("Value", observed=True, sort=False)["Count"].sum()
+    value_order = value_order.sort_values(ascending=False, kind="stable").index.tolist()
+    if OTHER_LABEL in value_order:
+        value_order.remove(OTHER_LABEL)
+        value_order.append(OTHER_LABEL)
+
+    fig = go.Figure()
+    for value in value_order:
+        subset = chart_data[chart_data["Value"] == value]
+        fig.add_trace(
+            go.Bar(
+                x=subset["Nationality"].astype(str),
+                y=subset["Percentage"],
+                name=str(value),
+                customdata=subset["Count"],
+                hovertemplate="%{x}<br>%{fullData.name}: %{y:.2f}% (n=%{customdata})<extra></extra>",
+            )
+        )
+    fig.update_layout(barmode="stack", title=title, xaxis_title="Nationality", yaxis_title="Percentage")
+    return fig
+
+
+# Cached analysis wrappers ---------------------------------------------------
+# The processor itself is not hashed (leading underscore); ``data_key`` is the
+# processor's fingerprint, so results are reused across reruns until the data changes.
+
+
+@st.cache_data(show_spinner=False)
+def cached_country_counts(_processor: SurveyDataProcessor, data_key: int) -> pd.DataFrame:
+    """Country counts for the loaded dataset."""
+    return calculate_country_counts(_processor.cleaned_data, _processor.country_column)
+
+
+@st.cache_data(show_spinner=False)
+def cached_question_counts(
+    _processor: SurveyDataProcessor,
+    _filtered_df: pd.DataFrame,
+    data_key: int,
+    countries: Tuple[str, ...],
+) -> pd.Series:
+    """Answer counts for every question, computed once per country selection."""
+    return calculate_question_counts(
+        _filtered_df,
+        _processor.country_column,
+        _processor.get_question_columns(),
+    )
+
+
+@st.cache_data(show_spinner=False)
+def cached_percentage_summary(
+    _processor: SurveyDataProcessor,
+    _filtered_df: pd.DataFrame,
+    data_key: int,
+    question: str,
+    countries: Tuple[str, ...],
+) -> Dict:
+    """Percentage summary for a question on the country-filtered data."""
+    return calculate_percentage_summary(
+        _processor,
+        question,
+        countries=list(countries) if countries else None,
+        filtered_data=_filtered_df,
+        question_counts=cached_question_counts(_processor, _filtered_df, data_key, countries),
+    )
+
+
+@st.cache_data(show_spinner=False)
+def cached_side_by_side(
+    _processor: SurveyDataProcessor,
+    _filtered_df: pd.DataFrame,
+    data_key: int,
+    question: str,
+    countries: Tuple[str, ...],
+) -> pd.DataFrame:
+    """Side-by-side comparison table for a question."""
+    return compare_side_by_side(
+        _processor,
+        question,
+        list(countries),
+        show_counts=True,
+        filtered_data=_filtered_df,
+    )
+
+
+@st.cache_data(show_spinner=False)
+def cached_comparison_report(
+    _processor: SurveyDataProcessor, data_key: int, question: str, countries: Tuple[str, ...]
+) -> str:
+    """Narrative comparison report (countries keep their selection order)."""
+    return generate_comparison_report(_processor, question, list(countries))
+
+
 def convert_df_to_csv(df: pd.DataFrame) -> bytes:
-    return df.to_csv(index=False).encode("utf-8")
+    """Serialize a DataFrame to UTF-8 CSV bytes using Arrow's CSV writer."""
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except pa.ArrowException:
+        # Mixed-type object columns cannot be converted to Arrow
+        return df.to_csv(index=False).encode("utf-8")
+
+    buffer = BytesIO()
+    pa_csv.write_csv(table, buffer)
+    return buffer.getvalue()
+
+
+@st.cache_data(show_spinner=False)
+def cached_csv(_df: pd.DataFrame, cache_key: Tuple) -> bytes:
+    """CSV bytes for a frame identified by ``cache_key`` rather than by hashing its rows."""
+    return convert_df_to_csv(_df)
 
 
 with st.sidebar:
@@ -107,7 +271,7 @@ with st.sidebar:
 
 processor: Optional[SurveyDataProcessor] = None
 if uploaded_file or (use_sample and os.path.exists(SAMPLE_FILE)):
-    processor = process_data(uploaded_file, use_sample)
+    processor = get_session_processor(uploaded_file, use_sample)
     if processor is None:
         st.error("Unable to load the dataset. Please verify the file format and try again.")
 else:
@@ -118,6 +282,7 @@ else:
 
 
 if processor and processor.cleaned_data is not None:
+    data_key = processor.fingerprint
     summary = processor.get_data_summary()
     countries = summary.get("countries", [])
     question_columns = processor.get_question_columns()
@@ -145,15 +310,21 @@ if processor and processor.cleaned_data is not None:
             help="Select the survey question to analyze in the tabs below.",
         )
 
-        value_options = sorted(
-            [str(v) for v in processor.cleaned_data[selected_question].dropna().unique() if str(v).strip()]
-        )
+        value_options = processor.unique_values.get(selected_question, [])
         selected_value = st.selectbox(
             "Response Value (for comparisons)",
             value_options if value_options else [],
             index=0 if value_options else None,
         )
 
+    # Filter once per rerun; every tab works from the same country selection
+    filtered_df = (
+        processor.cleaned_data[processor.cleaned_data[processor.country_column].isin(selected_countries)]
+        if selected_countries
+        else processor.cleaned_data
+    )
+    selected_key = tuple(sorted(selected_countries))
+
     # Tabs for multi-page layout
     tab_titles = ["Overview", "Question Explorer", "Comparisons", "Downloads"]
     tabs = st.tabs(tab_titles)
@@ -162,16 +333,23 @@ if processor and processor.cleaned_data is not None:
     # Overview Tab -----------------------------------------------------------
     with tab_map["Overview"]:
         st.subheader("Dataset Overview")
+        country_counts = cached_country_counts(processor, data_key)
+        if not country_counts.empty:
+            total_responses = int(country_counts["Count"].sum())
+            nationality_count = len(country_counts)
+        else:
+            total_responses = summary["cleaned_rows"]
+            nationality_count = len(countries)
+
         metrics = st.columns(4)
-        metrics[0].metric("Total Responses", summary["cleaned_rows"])
-        metrics[1].metric("Nationalities", len(countries))
+        metrics[0].metric("Total Responses", total_responses)
+        metrics[1].metric("Nationalities", nationality_count)
         metrics[2].metric("Questions Available", len(question_columns))
         metrics[3].metric(
             "Rows Removed During Cleaning",
             summary["cleaning_stats"]["rows_removed"] if summary["cleaning_stats"] else 0,
         )
 
-        country_counts = calculate_country_counts(processor.cleaned_data, processor.country_column)
         if not country_counts.empty:
             st.plotly_chart(
                 px.bar(
@@ -194,10 +372,12 @@ if processor and processor.cleaned_data is not None:
         st.subheader("Question Explorer")
         st.caption("Explore percentage breakdowns for the selected question across nationalities.")
 
-        percentage_summary = calculate_percentage_summary(
+        percentage_summary = cached_percentage_summary(
             processor,
+            filtered_df,
+            data_key,
             selected_question,
-            countries=selected_countries if selected_countries else None,
+            selected_key,
         )
 
         if percentage_summary:
@@ -206,15 +386,7 @@ if processor and processor.cleaned_data is not None:
 
             if by_country is not None and not by_country.empty:
                 st.plotly_chart(
-                    px.bar(
-                        by_country,
-                        x="Nationality",
-                        y="Percentage",
-                        color="Value",
-                        barmode="stack",
-                        title="Percentage Breakdown by Nationality",
-                        text="Percentage",
-                    ),
+                    build_stacked_bar(by_country, "Percentage Breakdown by Nationality"),
                     use_container_width=True,
                 )
                 st.dataframe(by_country, use_container_width=True, hide_index=True)
@@ -231,11 +403,12 @@ if processor and processor.cleaned_data is not None:
         st.caption("Compare responses between selected countries.")
 
         if selected_countries and len(selected_countries) >= 1:
-            comparison_table = compare_side_by_side(
+            comparison_table = cached_side_by_side(
                 processor,
+                filtered_df,
+                data_key,
                 selected_question,
-                selected_countries,
-                show_counts=True,
+                selected_key,
             )
             if not comparison_table.empty:
                 st.dataframe(comparison_table, use_container_width=True)
@@ -257,10 +430,11 @@ if processor and processor.cleaned_data is not None:
                         f"(Δ {diff_stats['difference']:.2f}%)"
                     )
 
-                report = generate_comparison_report(
+                report = cached_comparison_report(
                     processor,
+                    data_key,
                     selected_question,
-                    selected_countries[: min(3, len(selected_countries))],
+                    tuple(selected_countries[: min(3, len(selected_countries))]),
                 )
                 with st.expander("View Narrative Report"):
                     st.text(report)
@@ -272,24 +446,16 @@ if processor and processor.cleaned_data is not None:
         st.subheader("Downloads")
         st.caption("Export cleaned or filtered datasets for offline analysis.")
 
-        filtered_df = (
-            processor.cleaned_data[
-                processor.cleaned_data[processor.country_column].isin(selected_countries)
-            ].copy()
-            if selected_countries
-            else processor.cleaned_data
-        )
-
         st.download_button(
             label="Download Cleaned Dataset (CSV)",
-            data=convert_df_to_csv(processor.cleaned_data),
+            data=cached_csv(processor.cleaned_data, (data_key,)),
             file_name="cleaned_survey_data.csv",
             mime="text/csv",
         )
 
         st.download_button(
             label="Download Filtered Dataset (CSV)",
-            data=convert_df_to_csv(filtered_df),
+            data=cached_csv(filtered_df, (data_key, selected_key)),
             file_name="filtered_survey_data.csv",
             mime="text/csv",
         )
@@ -297,7 +463,10 @@ if processor and processor.cleaned_data is not None:
         if percentage_summary and percentage_summary.get("by_country") is not None:
             st.download_button(
                 label="Download Current Analysis (CSV)",
-                data=convert_df_to_csv(percentage_summary["by_country"]),
+                data=cached_csv(
+                    percentage_summary["by_country"],
+                    (data_key, selected_question, selected_key),
+                ),
                 file_name="analysis_by_country.csv",
                 mime="text/csv",
             )
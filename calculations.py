@@ -12,10 +12,100 @@ This module provides functionality to:
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 from data_processor import SurveyDataProcessor
 
 
+# Statistics supported by calculate_country_statistics()
+COUNTRY_STATISTICS = ('mean', 'median', 'std', 'count')
+
+
+def _observed_value_counts(series: pd.Series) -> pd.Series:
+    """
+    Count values in a Series, skipping unused categories of categorical columns.
+    
+    Args:
+        series (pd.Series): Values to count
+    
+    Returns:
+        pd.Series: Counts of the values that actually occur, most frequent first
+    """
+    counts = series.value_counts()
+    return counts[counts > 0]
+
+
+def _applicable_mask(series: pd.Series) -> pd.Series:
+    """
+    Build a boolean mask that is False for 'Not applicable' answers (case-insensitive).
+    
+    Only the distinct values (or categories) are inspected as strings; the rows
+    themselves are matched with isin, so the column is never converted to str.
+    Missing values count as applicable.
+    
+    Args:
+        series (pd.Series): Answer values
+    
+    Returns:
+        pd.Series: Boolean mask aligned with the series
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        candidates = series.cat.categories
+    else:
+        candidates = pd.Index(series.dropna().unique())
+    
+    is_not_applicable = candidates.astype('string').str.lower() == 'not applicable'
+    not_applicable = candidates[np.asarray(is_not_applicable, dtype=bool)]
+    if len(not_applicable) == 0:
+        return pd.Series(True, index=series.index)
+    
+    return ~series.isin(not_applicable)
+
+
+def _count_matrix(df: pd.DataFrame, row_column: str, column_column: str) -> pd.DataFrame:
+    """
+    Count co-occurring values of two columns (same result as pd.crosstab, without
+    its pivot_table round trip).
+    
+    Args:
+        df (pd.DataFrame): Data containing both columns
+        row_column (str): Column whose values become the rows
+        column_column (str): Column whose values become the columns
+    
+    Returns:
+        pd.DataFrame: Count matrix with missing combinations filled with 0
+    """
+    return df.groupby([row_column, column_column], observed=True).size().unstack(fill_value=0)
+
+
+def _breakdown_from_counts(counts: pd.Series,
+                           country_totals: Optional[pd.Series] = None) -> pd.DataFrame:
+    """
+    Build the by-nationality percentage table from (country, value) counts.
+    
+    Args:
+        counts (pd.Series): Response counts indexed by (country, value)
+        country_totals (pd.Series, optional): Denominator per country. If None, the
+            counts are summed per country
+    
+    Returns:
+        pd.DataFrame: DataFrame with columns: Nationality, Value, Count, Percentage, Total
+    """
+    breakdown = counts.rename_axis(['Nationality', 'Value']).reset_index(name='Count')
+    
+    # Calculate total counts per nationality
+    if country_totals is None:
+        breakdown['Total'] = breakdown.groupby('Nationality', observed=True, sort=False)['Count'].transform('sum')
+    else:
+        breakdown['Total'] = breakdown['Nationality'].map(country_totals).astype('int64')
+    
+    # Calculate percentages
+    breakdown['Percentage'] = np.round(
+        breakdown['Count'].to_numpy() / breakdown['Total'].to_numpy() * 100, 2
+    )
+    
+    return breakdown[['Nationality', 'Value', 'Count', 'Percentage', 'Total']]
+
+
 def calculate_nationality_percentage(df: pd.DataFrame,
                                     country_column: str,
                                     value_column: str,
@@ -37,42 +127,28 @@ def calculate_nationality_percentage(df: pd.DataFrame,
     if country_column not in df.columns or value_column not in df.columns:
         return pd.DataFrame()
     
-    # Filter out nulls if requested
-    df_filtered = df.copy()
+    # Build a single row mask for the requested filters
+    mask = pd.Series(True, index=df.index)
     if exclude_null:
-        df_filtered = df_filtered[df_filtered[value_column].notna()].copy()
+        mask &= df[value_column].notna()
     
     # Filter out 'Not applicable' if requested
     if exclude_not_applicable:
-        df_filtered = df_filtered[
-            df_filtered[value_column].astype(str).str.lower() != 'not applicable'
-        ].copy()
+        mask &= _applicable_mask(df[value_column])
     
-    # Group by nationality and value
-    grouped = df_filtered.groupby([country_column, value_column]).size().reset_index(name='Count')
+    # Only the two grouping columns are needed downstream
+    df_filtered = df.loc[mask, [country_column, value_column]]
     
-    # Calculate total counts per nationality
-    country_totals = df_filtered.groupby(country_column).size()
+    # Group by nationality and value
+    counts = df_filtered.groupby([country_column, value_column], observed=True).size()
     
-    # Calculate percentages
-    result_data = []
-    for _, row in grouped.iterrows():
-        country = row[country_column]
-        value = row[value_column]
-        count = row['Count']
-        
-        country_total = country_totals.get(country, 0)
-        percentage = (count / country_total * 100) if country_total > 0 else 0
-        
-        result_data.append({
-            'Nationality': country,
-            'Value': value,
-            'Count': count,
-            'Percentage': round(percentage, 2),
-            'Total': country_total
-        })
+    # With nulls excluded every filtered row falls in a (country, value) group, so
+    # the totals can come from the grouped counts instead of a second pass
+    country_totals = None
+    if not exclude_null:
+        country_totals = df_filtered.groupby(country_column, observed=True, sort=False).size()
     
-    return pd.DataFrame(result_data)
+    return _breakdown_from_counts(counts, country_totals)
 
 
 def calculate_overall_percentage(df: pd.DataFrame,
@@ -94,23 +170,22 @@ def calculate_overall_percentage(df: pd.DataFrame,
     if value_column not in df.columns:
         return pd.DataFrame()
     
+    values = df[value_column]
+    
     # Filter out nulls if requested
-    df_filtered = df.copy()
     if exclude_null:
-        df_filtered = df_filtered[df_filtered[value_column].notna()].copy()
+        values = values[values.notna()]
     
     # Filter out 'Not applicable' if requested
     if exclude_not_applicable:
-        df_filtered = df_filtered[
-            df_filtered[value_column].astype(str).str.lower() != 'not applicable'
-        ].copy()
+        values = values[_applicable_mask(values)]
     
     # Calculate value counts
-    value_counts = df_filtered[value_column].value_counts().reset_index()
+    value_counts = _observed_value_counts(values).reset_index()
     value_counts.columns = ['Value', 'Count']
     
     # Calculate percentages
-    total = len(df_filtered)
+    total = len(values)
     value_counts['Percentage'] = (value_counts['Count'] / total * 100).round(2)
     
     return value_counts
@@ -132,27 +207,39 @@ def calculate_country_statistics(df: pd.DataFrame,
     Returns:
         pd.DataFrame: DataFrame with statistics by country
     """
+    return calculate_country_statistics_multi(df, country_column, value_column, [statistic])
+
+
+def calculate_country_statistics_multi(df: pd.DataFrame,
+                                      country_column: str,
+                                      value_column: str,
+                                      statistics: Sequence[str] = COUNTRY_STATISTICS) -> pd.DataFrame:
+    """
+    Calculate several statistical summaries by country in a single grouped pass.
+    
+    Args:
+        df (pd.DataFrame): Cleaned survey data
+        country_column (str): Name of country/nationality column
+        value_column (str): Name of numeric column to analyze
+        statistics (Sequence[str]): Measures to compute, any of 'mean', 'median', 'std',
+            'count'. Defaults to all four
+    
+    Returns:
+        pd.DataFrame: DataFrame with Nationality and one title-cased column per statistic
+    """
     if country_column not in df.columns or value_column not in df.columns:
         return pd.DataFrame()
     
-    # Convert to numeric if possible
-    df_numeric = df.copy()
-    df_numeric[value_column] = pd.to_numeric(df_numeric[value_column], errors='coerce')
-    
-    # Calculate statistic by country
-    if statistic == 'mean':
-        stats = df_numeric.groupby(country_column)[value_column].mean()
-    elif statistic == 'median':
-        stats = df_numeric.groupby(country_column)[value_column].median()
-    elif statistic == 'std':
-        stats = df_numeric.groupby(country_column)[value_column].std()
-    elif statistic == 'count':
-        stats = df_numeric.groupby(country_column)[value_column].count()
-    else:
+    if not statistics or any(stat not in COUNTRY_STATISTICS for stat in statistics):
         return pd.DataFrame()
     
-    result = stats.reset_index()
-    result.columns = ['Nationality', statistic.title()]
+    # Convert to numeric if possible (without copying the whole frame)
+    numeric_values = pd.to_numeric(df[value_column], errors='coerce')
+    grouped = numeric_values.groupby(df[country_column], observed=True)
+    
+    # Calculate all statistics by country at once
+    result = grouped.agg(list(statistics)).reset_index()
+    result.columns = ['Nationality'] + [stat.title() for stat in statistics]
     
     return result
 
@@ -200,11 +287,11 @@ def calculate_multiple_ratings_comparison(processor: SurveyDataProcessor,
     if processor.cleaned_data is None or processor.country_column is None:
         return pd.DataFrame()
     
-    df = processor.cleaned_data.copy()
+    df = processor.cleaned_data
     
     # Filter by countries if specified
     if countries:
-        df = df[df[processor.country_column].isin(countries)].copy()
+        df = df[df[processor.country_column].isin(countries)]
     
     all_results = []
     
@@ -250,19 +337,11 @@ def calculate_response_distribution(df: pd.DataFrame,
         return pd.DataFrame()
     
     # Create pivot table
-    pivot_table = pd.crosstab(
-        df[country_column],
-        df[value_column],
-        normalize='index' if normalize else False,
-        dropna=True
-    )
+    pivot_table = _count_matrix(df, country_column, value_column)
     
-    # Convert to percentage if normalized
+    # Convert to percentage if normalized, rounded to 2 decimal places
     if normalize:
-        pivot_table = pivot_table * 100
-    
-    # Round to 2 decimal places
-    pivot_table = pivot_table.round(2)
+        pivot_table = (pivot_table.div(pivot_table.sum(axis=1), axis=0) * 100).round(2)
     
     return pivot_table.reset_index()
 
@@ -282,13 +361,16 @@ def calculate_country_counts(df: pd.DataFrame,
     if country_column not in df.columns:
         return pd.DataFrame()
     
-    counts = df[country_column].value_counts().reset_index()
-    counts.columns = ['Nationality', 'Count']
+    # Single pass over the country column; counts, total and nationality list
+    # all come from the same value_counts result
+    counts = _observed_value_counts(df[country_column])
+    count_values = counts.to_numpy()
     
-    total = len(df)
-    counts['Percentage'] = (counts['Count'] / total * 100).round(2)
-    
-    return counts.sort_values('Nationality')
+    return pd.DataFrame({
+        'Nationality': counts.index,
+        'Count': count_values,
+        'Percentage': np.round(count_values / len(df) * 100, 2)
+    }).sort_values('Nationality', ignore_index=True)
 
 
 def calculate_importance_factor_ranking(processor: SurveyDataProcessor,
@@ -308,11 +390,11 @@ def calculate_importance_factor_ranking(processor: SurveyDataProcessor,
     if processor.cleaned_data is None or processor.country_column is None:
         return pd.DataFrame()
     
-    df = processor.cleaned_data.copy()
+    df = processor.cleaned_data
     
     # Filter by countries if specified
     if countries:
-        df = df[df[processor.country_column].isin(countries)].copy()
+        df = df[df[processor.country_column].isin(countries)]
     
     # Calculate percentages
     breakdown = calculate_nationality_percentage(
@@ -329,10 +411,10 @@ def calculate_importance_factor_ranking(processor: SurveyDataProcessor,
     # Filter for high importance (Extremely or Very)
     high_importance = breakdown[
         breakdown['Value'].isin(['Extremely', 'Very'])
-    ].copy()
+    ]
     
     # Sum percentages for 'Extremely' and 'Very' per country
-    ranking = high_importance.groupby('Nationality')['Percentage'].sum().reset_index()
+    ranking = high_importance.groupby('Nationality', observed=True)['Percentage'].sum().reset_index()
     ranking.columns = ['Nationality', 'High_Importance_%']
     ranking = ranking.sort_values('High_Importance_%', ascending=False)
     
@@ -359,36 +441,68 @@ def calculate_cross_tabulation(df: pd.DataFrame,
     Returns:
         pd.DataFrame: Cross-tabulation table
     """
-    df_filtered = df.copy()
+    df_filtered = df
     
     # Filter by country if specified
     if country_filter and country_column and country_column in df.columns:
-        df_filtered = df_filtered[df_filtered[country_column] == country_filter].copy()
+        df_filtered = df[df[country_column] == country_filter]
     
     if row_column not in df_filtered.columns or column_column not in df_filtered.columns:
         return pd.DataFrame()
     
     # Create cross-tabulation
+    crosstab = _count_matrix(df_filtered, row_column, column_column)
+    
     if normalize:
-        crosstab = pd.crosstab(
-            df_filtered[row_column],
-            df_filtered[column_column],
-            normalize='index' if normalize else False,
-            dropna=True
-        ) * 100
-    else:
-        crosstab = pd.crosstab(
-            df_filtered[row_column],
-            df_filtered[column_column],
-            dropna=True
-        )
+        crosstab = (crosstab.div(crosstab.sum(axis=1), axis=0) * 100).round(2)
     
-    return crosstab.round(2)
+    return crosstab
+
+
+def calculate_question_counts(df: pd.DataFrame,
+                              country_column: str,
+                              question_columns: List[str]) -> pd.Series:
+    """
+    Count answers per question, nationality and value for many questions in one pass.
+    
+    The result can be passed to calculate_percentage_summary() so that browsing
+    several questions on the same data does not rescan the rows for each one.
+    
+    Args:
+        df (pd.DataFrame): Cleaned survey data
+        country_column (str): Name of country/nationality column
+        question_columns (List[str]): Question columns to include
+    
+    Returns:
+        pd.Series: Counts indexed by (Question, country, Value). Unanswered cells are
+            skipped; answers without a country are kept under a missing country
+    """
+    columns = [col for col in question_columns if col in df.columns and col != country_column]
+    if country_column not in df.columns or not columns:
+        return pd.Series(dtype='int64')
+    
+    # Long format: one row per (respondent, question) answer
+    long_df = df.melt(
+        id_vars=[country_column],
+        value_vars=columns,
+        var_name='Question',
+        value_name='Value'
+    )
+    long_df = long_df[long_df['Value'].notna()]
+    
+    return long_df.groupby(
+        ['Question', country_column, 'Value'],
+        observed=True,
+        dropna=False,
+        sort=False
+    ).size()
 
 
 def calculate_percentage_summary(processor: SurveyDataProcessor,
                                 question_column: str,
-                                countries: Optional[List[str]] = None) -> Dict:
+                                countries: Optional[List[str]] = None,
+                                filtered_data: Optional[pd.DataFrame] = None,
+                                question_counts: Optional[pd.Series] = None) -> Dict:
     """
     Calculate comprehensive percentage summary for a question.
     
@@ -396,6 +510,10 @@ def calculate_percentage_summary(processor: SurveyDataProcessor,
         processor (SurveyDataProcessor): Processed survey data processor
         question_column (str): Column name to analyze
         countries (List[str], optional): List of countries to include. If None, includes all
+        filtered_data (pd.DataFrame, optional): Cleaned data already filtered to the
+            selected countries. If given, it is used as-is instead of filtering again
+        question_counts (pd.Series, optional): Output of calculate_question_counts() for
+            the same rows. If it covers the question, the rows are not scanned again
     
     Returns:
         Dict: Summary dictionary with:
@@ -407,32 +525,46 @@ def calculate_percentage_summary(processor: SurveyDataProcessor,
     if processor.cleaned_data is None or processor.country_column is None:
         return {}
     
-    df = processor.cleaned_data.copy()
+    if filtered_data is not None:
+        df = filtered_data
+    else:
+        df = processor.cleaned_data
+        
+        # Filter by countries if specified
+        if countries:
+            df = df[df[processor.country_column].isin(countries)]
     
-    # Filter by countries if specified
-    if countries:
-        df = df[df[processor.country_column].isin(countries)].copy()
+    country_column = processor.country_column
     
-    # Calculate by country
-    by_country = calculate_nationality_percentage(
-        df,
-        processor.country_column,
-        question_column,
-        exclude_null=True
-    )
+    # Country totals
+    country_totals = _observed_value_counts(df[country_column]).to_dict()
     
-    # Calculate overall
-    overall = calculate_overall_percentage(
-        df,
-        question_column,
-        exclude_null=True
-    )
+    # One grouping of the answered rows feeds the by-country breakdown, the overall
+    # breakdown and the value counts. Rows without a country are kept in the
+    # grouping so they still count towards the overall figures.
+    counts = None
+    if question_counts is not None:
+        try:
+            counts = question_counts.xs(question_column, level=0).sort_index()
+        except KeyError:
+            counts = None
     
-    # Country totals
-    country_totals = df[processor.country_column].value_counts().to_dict()
+    if counts is None:
+        answered = df.loc[df[question_column].notna(), [country_column, question_column]]
+        counts = answered.groupby([country_column, question_column], observed=True, dropna=False).size()
+    
+    # Calculate by country
+    has_country = counts.index.get_level_values(0).notna()
+    by_country = _breakdown_from_counts(counts[has_country])
+    
+    # Value counts, most frequent first
+    value_totals = counts.groupby(level=1, observed=True).sum()
+    value_totals = value_totals[value_totals > 0].sort_values(ascending=False)
+    value_counts = value_totals.to_dict()
     
-    # Value counts
-    value_counts = df[question_column].value_counts().to_dict()
+    # Calculate overall
+    overall = value_totals.rename_axis('Value').reset_index(name='Count')
+    overall['Percentage'] = (overall['Count'] / counts.sum() * 100).round(2)
     
     return {
         'by_country': by_country,
@@ -11,12 +11,282 @@ This module provides functionality to:
 - Difference calculations between groups
 """
 
+import io
+import os
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Optional, Tuple, Union
 from scipy import stats
-from data_processor import SurveyDataProcessor
-from calculations import calculate_nationality_percentage, calculate_response_distribution
+from data_processor import BREAKDOWN_CACHE_SIZE, SurveyDataProcessor, detect_rating_kind
+from calculations import (
+    _applicable_mask,
+    calculate_nationality_percentage,
+    calculate_response_distribution,
+)
+
+
+# Default display order of each rating scale kind (see data_processor.RATING_KIND_KEYWORDS)
+RATING_ORDERS = {
+    'important': ['Not at all', 'A little', 'Moderately', 'Very', 'Extremely'],
+    'agree': ['Strongly disagree', 'Mildly disagree', 'Neither agree nor disagree',
+              'Neutral', 'Mildly agree', 'Strongly agree', 'Agree', 'Disagree'],
+    'difficult': ['Not at all', 'Slightly (a little)', 'Moderately', 'Very', 'Extremely'],
+}
+
+
+def _cached_breakdown_entry(processor: SurveyDataProcessor,
+                            question_column: str,
+                            exclude_null: bool = True,
+                            exclude_not_applicable: bool = False) -> Dict:
+    """
+    Get the memoized cache entry holding a question's nationality breakdown.
+    
+    Args:
+        processor (SurveyDataProcessor): Processed survey data processor
+        question_column (str): Column name to analyze
+        exclude_null (bool): Whether to exclude null values. Default True
+        exclude_not_applicable (bool): Whether to exclude 'Not applicable'. Default False
+    
+    Returns:
+        Dict: Entry with the 'breakdown' DataFrame (and 'lookup' once built)
+    """
+    cache = processor._breakdown_cache
+    key = (processor._generation, processor.country_column, question_column,
+           exclude_null, exclude_not_applicable)
+    
+    if key in cache:
+        # Move to the end so the least recently used entry is evicted first
+        entry = cache.pop(key)
+        cache[key] = entry
+        return entry
+    
+    breakdown = calculate_nationality_percentage(
+        processor.cleaned_data,
+        processor.country_column,
+        question_column,
+        exclude_null=exclude_null,
+        exclude_not_applicable=exclude_not_applicable
+    )
+    
+    if len(cache) >= BREAKDOWN_CACHE_SIZE:
+        cache.pop(next(iter(cache)), None)
+    entry = {'breakdown': breakdown}
+    cache[key] = entry
+    
+    return entry
+
+
+def _cached_breakdown(processor: SurveyDataProcessor,
+                      question_column: str,
+                      exclude_null: bool = True,
+                      exclude_not_applicable: bool = False) -> pd.DataFrame:
+    """
+    Get the nationality percentage breakdown of the full cleaned data, memoized on the processor.
+    
+    The returned DataFrame is shared between callers and must not be modified in place.
+    
+    Args:
+        processor (SurveyDataProcessor): Processed survey data processor
+        question_column (str): Column name to analyze
+        exclude_null (bool): Whether to exclude null values. Default True
+        exclude_not_applicable (bool): Whether to exclude 'Not applicable'. Default False
+    
+    Returns:
+        pd.DataFrame: Output of calculate_nationality_percentage()
+    """
+    return _cached_breakdown_entry(
+        processor, question_column, exclude_null, exclude_not_applicable
+    )['breakdown']
+
+
+def _cached_breakdown_lookup(processor: SurveyDataProcessor,
+                             question_column: str,
+                             exclude_null: bool = True) -> Dict:
+    """
+    Get a (value, nationality) -> row position matrix for a cached breakdown.
+    
+    Built once per breakdown so single-value lookups are dict/array reads instead
+    of boolean scans over the breakdown.
+    
+    Args:
+        processor (SurveyDataProcessor): Processed survey data processor
+        question_column (str): Column name to analyze
+        exclude_null (bool): Whether to exclude null values. Default True
+    
+    Returns:
+        Dict: Lookup with keys:
+            - 'breakdown' (pd.DataFrame): The cached breakdown
+            - 'positions' (np.ndarray): Row position per [value, nationality], -1 if absent
+            - 'percentages' (np.ndarray): Percentage column of the breakdown
+            - 'value_index' (dict): Value -> row of 'positions'
+            - 'nationality_index' (dict): Nationality -> column of 'positions'
+    """
+    entry = _cached_breakdown_entry(processor, question_column, exclude_null)
+    
+    if 'lookup' not in entry:
+        breakdown = entry['breakdown']
+        value_codes, values = pd.factorize(breakdown['Value'])
+        nationality_codes, nationalities = pd.factorize(breakdown['Nationality'])
+        
+        positions = np.full((len(values), len(nationalities)), -1, dtype=np.intp)
+        positions[value_codes, nationality_codes] = np.arange(len(breakdown))
+        
+        entry['lookup'] = {
+            'breakdown': breakdown,
+            'positions': positions,
+            'percentages': breakdown['Percentage'].to_numpy(),
+            'value_index': {v: i for i, v in enumerate(values)},
+            'nationality_index': {n: i for i, n in enumerate(nationalities)}
+        }
+    
+    return entry['lookup']
+
+
+def _lookup_positions(lookup: Dict, nationalities: List[str], value) -> np.ndarray:
+    """
+    Find breakdown row positions for a value and several nationalities.
+    
+    Args:
+        lookup (Dict): Output of _cached_breakdown_lookup()
+        nationalities (List[str]): Nationalities to look up
+        value: Response value to look up
+    
+    Returns:
+        np.ndarray: Row position per nationality, -1 where there is no such row
+    """
+    value_idx = lookup['value_index'].get(value)
+    if value_idx is None:
+        return np.full(len(nationalities), -1, dtype=np.intp)
+    
+    row = lookup['positions'][value_idx]
+    return np.array([
+        row[lookup['nationality_index'][n]] if n in lookup['nationality_index'] else -1
+        for n in nationalities
+    ], dtype=np.intp)
+
+
+def _cached_applicable_mask(processor: SurveyDataProcessor, question_column: str) -> np.ndarray:
+    """
+    Get the 'Not applicable' filter for a question over the full cleaned data, memoized on the processor.
+    
+    Args:
+        processor (SurveyDataProcessor): Processed survey data processor
+        question_column (str): Column name to analyze
+    
+    Returns:
+        np.ndarray: Boolean array aligned with cleaned_data, False for 'Not applicable' rows
+    """
+    key = (processor._generation, question_column)
+    mask = processor._applicable_masks.get(key)
+    
+    if mask is None:
+        mask = _applicable_mask(processor.cleaned_data[question_column]).to_numpy(dtype=bool)
+        processor._applicable_masks[key] = mask
+    
+    return mask
+
+
+def _cached_country_mask(processor: SurveyDataProcessor, countries: List[str]) -> np.ndarray:
+    """
+    Get the row filter for a set of countries over the full cleaned data, memoized on the processor.
+    
+    Args:
+        processor (SurveyDataProcessor): Processed survey data processor
+        countries (List[str]): Countries to keep (order does not matter)
+    
+    Returns:
+        np.ndarray: Boolean array aligned with cleaned_data, True for rows of the countries
+    """
+    cache = processor._country_masks
+    key = (processor._generation, processor.country_column,
+           tuple(sorted(set(countries), key=str)))
+    mask = cache.get(key)
+    
+    if mask is None:
+        mask = processor._country_mask(countries)
+        if len(cache) >= BREAKDOWN_CACHE_SIZE:
+            cache.pop(next(iter(cache)), None)
+        cache[key] = mask
+    
+    return mask
+
+
+def _present_countries(processor: SurveyDataProcessor, countries: List[str]) -> List[str]:
+    """
+    Keep only the countries that have responses, using the cached per-country counts.
+    
+    Args:
+        processor (SurveyDataProcessor): Processed survey data processor
+        countries (List[str]): Requested countries
+    
+    Returns:
+        List[str]: Requested countries present in the cleaned data, in the given order
+    """
+    counts = processor.get_nationality_counts()
+    return [country for country in countries if counts.get(country, 0) > 0]
+
+
+def _plain_index(index: pd.Index, name: str) -> pd.Index:
+    """
+    Convert a (possibly categorical) index of labels into a plain named index.
+    
+    Args:
+        index (pd.Index): Index produced by a groupby on categorical columns
+        name (str): Name for the resulting index
+    
+    Returns:
+        pd.Index: Index with the same labels and no categorical dtype
+    """
+    return pd.Index(index.tolist(), name=name)
+
+
+def _tally_percentages(processor: SurveyDataProcessor,
+                       question_column: str,
+                       countries: List[str],
+                       exclude_not_applicable: bool = False) -> Tuple[np.ndarray, pd.Index, pd.Index]:
+    """
+    Tally a question's answers into a (values x countries) percentage matrix in one pass.
+    
+    Countries and answers are integer-coded with pd.factorize and counted with a single
+    np.bincount; labels are sorted the same way a groupby on the columns would sort them.
+    
+    Args:
+        processor (SurveyDataProcessor): Processed survey data processor
+        question_column (str): Column name to analyze
+        countries (List[str]): List of countries to include
+        exclude_not_applicable (bool): Whether to exclude 'Not applicable'. Default False
+    
+    Returns:
+        Tuple[np.ndarray, pd.Index, pd.Index]: Percentages within each country (columns),
+            the answer labels (rows) and the country labels (columns)
+    """
+    # Absent countries are dropped before any row mask is built
+    countries = _present_countries(processor, countries)
+    if not countries:
+        return np.empty((0, 0)), pd.Index([]), pd.Index([])
+    
+    df = processor.cleaned_data
+    country_values = df[processor.country_column]
+    answers = df[question_column]
+    
+    # Answered (and optionally applicable) responses of the requested countries
+    mask = _cached_country_mask(processor, countries) & answers.notna().to_numpy(dtype=bool)
+    if exclude_not_applicable:
+        mask &= _cached_applicable_mask(processor, question_column)
+    
+    country_codes, country_labels = pd.factorize(country_values[mask], sort=True)
+    value_codes, value_labels = pd.factorize(answers[mask], sort=True)
+    
+    n_values, n_countries = len(value_labels), len(country_labels)
+    counts = np.bincount(
+        value_codes * n_countries + country_codes,
+        minlength=n_values * n_countries
+    ).reshape(n_values, n_countries)
+    
+    percentages = np.round(counts / counts.sum(axis=0) * 100, 2)
+    
+    return percentages, pd.Index(value_labels), pd.Index(country_labels)
 
 
 def compare_nationalities(processor: SurveyDataProcessor,
@@ -41,69 +311,29 @@ def compare_nationalities(processor: SurveyDataProcessor,
     if question_column not in processor.cleaned_data.columns:
         return pd.DataFrame()
     
-    # Filter data for specified countries
-    df_filtered = processor.cleaned_data[
-        processor.cleaned_data[processor.country_column].isin(countries)
-    ].copy()
-    
-    # Calculate percentages for each country
-    comparison_data = []
+    # Percentages with values as rows and countries as columns
+    percentages, values, found_countries = _tally_percentages(
+        processor,
+        question_column,
+        countries,
+        exclude_not_applicable=exclude_not_applicable
+    )
     
-    for country in countries:
-        country_data = df_filtered[
-            df_filtered[processor.country_column] == country
-        ].copy()
-        
-        if len(country_data) == 0:
-            continue
-        
-        # Calculate value counts and percentages
-        value_counts = country_data[question_column].value_counts()
-        total = len(country_data[country_data[question_column].notna()])
-        
-        if exclude_not_applicable:
-            value_counts = value_counts[
-                value_counts.index.astype(str).str.lower() != 'not applicable'
-            ]
-            total = country_data[
-                (country_data[question_column].notna()) &
-                (country_data[question_column].astype(str).str.lower() != 'not applicable')
-            ].shape[0]
-        
-        percentages = (value_counts / total * 100).round(2) if total > 0 else pd.Series()
-        
-        for value, count in value_counts.items():
-            pct = percentages[value] if value in percentages.index else 0
-            comparison_data.append({
-                'Value': value,
-                'Country': country,
-                'Count': count,
-                'Percentage': pct,
-                'Total': total
-            })
-    
-    if not comparison_data:
+    if percentages.size == 0:
         return pd.DataFrame()
     
-    # Create comparison table
-    comparison_df = pd.DataFrame(comparison_data)
-    
-    # Pivot table for easier comparison
-    pivot_table = comparison_df.pivot_table(
-        index='Value',
-        columns='Country',
-        values='Percentage',
-        aggfunc='first',
-        fill_value=0
+    return pd.DataFrame(
+        percentages,
+        index=_plain_index(values, 'Value'),
+        columns=_plain_index(found_countries, 'Country')
     )
-    
-    return pivot_table
 
 
 def compare_side_by_side(processor: SurveyDataProcessor,
                         question_column: str,
                         countries: List[str],
-                        show_counts: bool = True) -> pd.DataFrame:
+                        show_counts: bool = True,
+                        filtered_data: Optional[pd.DataFrame] = None) -> pd.DataFrame:
     """
     Create side-by-side comparison table for multiple countries.
     
@@ -112,6 +342,8 @@ def compare_side_by_side(processor: SurveyDataProcessor,
         question_column (str): Column name to analyze
         countries (List[str]): List of countries to compare
         show_counts (bool): Whether to show counts alongside percentages. Default True
+        filtered_data (pd.DataFrame, optional): Cleaned data already filtered to the
+            countries. If given, percentages are calculated from it instead of the full data
     
     Returns:
         pd.DataFrame: Side-by-side comparison with Count (Percentage) format
@@ -120,36 +352,46 @@ def compare_side_by_side(processor: SurveyDataProcessor,
         return pd.DataFrame()
     
     # Calculate percentages for each country
-    breakdown = calculate_nationality_percentage(
-        processor.cleaned_data,
-        processor.country_column,
-        question_column,
-        exclude_null=True
-    )
+    if filtered_data is not None:
+        breakdown = calculate_nationality_percentage(
+            filtered_data,
+            processor.country_column,
+            question_column,
+            exclude_null=True
+        )
+    else:
+        breakdown = _cached_breakdown(processor, question_column, exclude_null=True)
+    
+    if not _present_countries(processor, countries):
+        return pd.DataFrame()
     
     # Filter for specified countries
-    breakdown = breakdown[breakdown['Nationality'].isin(countries)].copy()
+    breakdown = breakdown[breakdown['Nationality'].isin(countries)]
     
     if breakdown.empty:
         return pd.DataFrame()
     
+    # Pivot counts and percentages numerically, then format the 2-D arrays once
+    # (Value, Nationality) pairs are unique in a breakdown, so a direct reshape suffices
+    pivot_table = breakdown.set_index(['Value', 'Nationality'])[['Count', 'Percentage']].unstack(
+        'Nationality'
+    ).sort_index().sort_index(axis=1)
+    counts = pivot_table['Count']
+    present = counts.notna().to_numpy()
+    percentages = np.char.add(pivot_table['Percentage'].to_numpy(dtype=float).astype(str), '%')
+    
     # Create side-by-side format
     if show_counts:
-        breakdown['Count_Pct'] = breakdown['Count'].astype(str) + ' (' + \
-                                  breakdown['Percentage'].astype(str) + '%)'
+        count_strs = counts.fillna(0).to_numpy(dtype=np.int64).astype(str)
+        formatted = np.char.add(np.char.add(count_strs, ' ('), np.char.add(percentages, ')'))
     else:
-        breakdown['Count_Pct'] = breakdown['Percentage'].astype(str) + '%'
-    
-    # Pivot table
-    pivot_table = breakdown.pivot_table(
-        index='Value',
-        columns='Nationality',
-        values='Count_Pct',
-        aggfunc='first',
-        fill_value='0 (0%)'
-    )
+        formatted = percentages
     
-    return pivot_table
+    return pd.DataFrame(
+        np.where(present, formatted, '0 (0%)').astype(object),
+        index=counts.index,
+        columns=counts.columns
+    )
 
 
 def calculate_difference_between_countries(processor: SurveyDataProcessor,
@@ -173,29 +415,15 @@ def calculate_difference_between_countries(processor: SurveyDataProcessor,
     if processor.cleaned_data is None or processor.country_column is None:
         return {}
     
-    # Calculate percentages
-    breakdown = calculate_nationality_percentage(
-        processor.cleaned_data,
-        processor.country_column,
-        question_column,
-        exclude_null=True
-    )
-    
-    # Filter for specific countries and value
-    filtered = breakdown[
-        (breakdown['Nationality'].isin([country1, country2])) &
-        (breakdown['Value'] == value)
-    ].copy()
+    # Look up both percentages in the cached breakdown
+    lookup = _cached_breakdown_lookup(processor, question_column, exclude_null=True)
+    pos1, pos2 = _lookup_positions(lookup, [country1, country2], value)
     
-    if filtered.empty:
+    if pos1 < 0 and pos2 < 0:
         return {}
     
-    # Get percentages
-    pct1 = filtered[filtered['Nationality'] == country1]['Percentage'].values
-    pct2 = filtered[filtered['Nationality'] == country2]['Percentage'].values
-    
-    pct1_value = pct1[0] if len(pct1) > 0 else 0
-    pct2_value = pct2[0] if len(pct2) > 0 else 0
+    pct1_value = lookup['percentages'][pos1] if pos1 >= 0 else 0
+    pct2_value = lookup['percentages'][pos2] if pos2 >= 0 else 0
     
     difference = pct1_value - pct2_value
     
@@ -229,39 +457,41 @@ def compare_rating_scales_across_countries(processor: SurveyDataProcessor,
     if processor.cleaned_data is None or processor.country_column is None:
         return pd.DataFrame()
     
-    # Get comparison table
-    comparison = compare_nationalities(
+    if question_column not in processor.cleaned_data.columns:
+        return pd.DataFrame()
+    
+    # Percentages with values as rows and countries as columns
+    percentages, values, found_countries = _tally_percentages(
         processor,
         question_column,
         countries,
         exclude_not_applicable=True
     )
     
-    if comparison.empty:
+    if percentages.size == 0:
         return pd.DataFrame()
     
-    # Default rating orders
+    values = values.tolist()
+    
+    # Default rating orders, by the rating kind detected from the column name
     if rating_order is None:
-        # Detect rating type from column name
-        col_lower = question_column.lower()
-        if 'important' in col_lower:
-            rating_order = ['Not at all', 'A little', 'Moderately', 'Very', 'Extremely']
-        elif 'agree' in col_lower:
-            rating_order = ['Strongly disagree', 'Mildly disagree', 'Neither agree nor disagree',
-                          'Neutral', 'Mildly agree', 'Strongly agree', 'Agree', 'Disagree']
-        elif 'difficult' in col_lower:
-            rating_order = ['Not at all', 'Slightly (a little)', 'Moderately', 'Very', 'Extremely']
+        if question_column in processor._rating_kind:
+            kind = processor._rating_kind[question_column]
         else:
-            rating_order = comparison.index.tolist()
-    
-    # Reorder index
-    existing_ratings = [r for r in rating_order if r in comparison.index]
-    other_ratings = [r for r in comparison.index if r not in rating_order]
-    ordered_index = existing_ratings + other_ratings
-    
-    comparison = comparison.reindex(ordered_index)
-    
-    return comparison
+            kind = detect_rating_kind(question_column)
+        rating_order = RATING_ORDERS.get(kind) or values
+    
+    # Rank rows through categorical codes: known ratings first in rating order,
+    # then the remaining values in table order
+    categories = list(dict.fromkeys(list(rating_order) + values))
+    codes = pd.Categorical(values, categories=categories).codes
+    ordered_rows = np.argsort(codes, kind='stable')
+    
+    return pd.DataFrame(
+        percentages[ordered_rows],
+        index=pd.Index(np.asarray(values, dtype=object)[ordered_rows].tolist(), name='Value'),
+        columns=_plain_index(found_countries, 'Country')
+    )
 
 
 def calculate_statistical_significance(processor: SurveyDataProcessor,
@@ -285,18 +515,25 @@ def calculate_statistical_significance(processor: SurveyDataProcessor,
     if processor.cleaned_data is None or processor.country_column is None:
         return {}
     
-    df = processor.cleaned_data.copy()
+    df = processor.cleaned_data
+    countries = df[processor.country_column]
     
-    # Filter for two countries
-    df_filtered = df[df[processor.country_column].isin([country1, country2])].copy()
+    # Countries without responses would only contribute empty rows, so skip their scans
+    present = _present_countries(processor, list(dict.fromkeys([country1, country2])))
     
-    # Create contingency table
-    contingency = pd.crosstab(
-        df_filtered[processor.country_column],
-        df_filtered[question_column] == value
-    )
+    # Create the 2x2 contingency table (country x matches value) from boolean arrays
+    is_value = df[question_column].eq(value).to_numpy(dtype=bool, na_value=False)
+    rows = []
+    for country in present:
+        is_country = countries.eq(country).to_numpy(dtype=bool, na_value=False)
+        rows.append([np.count_nonzero(is_country & is_value),
+                     np.count_nonzero(is_country & ~is_value)])
+    contingency = np.array(rows).reshape(-1, 2)
     
-    if contingency.shape[1] < 2:
+    # Countries without responses do not contribute a row
+    contingency = contingency[contingency.sum(axis=1) > 0]
+    
+    if contingency.size == 0 or (contingency.sum(axis=0) == 0).any():
         return {
             'country1': country1,
             'country2': country2,
@@ -329,6 +566,80 @@ def calculate_statistical_significance(processor: SurveyDataProcessor,
         }
 
 
+def calculate_pairwise_significance(processor: SurveyDataProcessor,
+                                    question_column: str,
+                                    countries: List[str],
+                                    value: str) -> pd.DataFrame:
+    """
+    Run the chi-square test of calculate_statistical_significance() for every pair of countries.
+    
+    The per-country counts are tallied once and every 2x2 table is evaluated with the
+    closed-form statistic (with Yates' correction, as scipy applies for 1 degree of
+    freedom), so the cost does not grow with a DataFrame pass per pair.
+    
+    Args:
+        processor (SurveyDataProcessor): Processed survey data processor
+        question_column (str): Column name to analyze
+        countries (List[str]): List of countries to test pairwise
+        value (str): Response value to test
+    
+    Returns:
+        pd.DataFrame: One row per country pair with columns: Country 1, Country 2,
+            Chi-Square, P-Value, Degrees of Freedom, Significant, Interpretation
+    """
+    if processor.cleaned_data is None or processor.country_column is None:
+        return pd.DataFrame()
+    
+    countries = list(dict.fromkeys(countries))
+    if len(countries) < 2:
+        return pd.DataFrame()
+    
+    df = processor.cleaned_data
+    
+    # Tally matching / non-matching responses per country in one pass
+    codes = pd.Categorical(df[processor.country_column], categories=countries).codes
+    is_value = df[question_column].eq(value).to_numpy(dtype=bool, na_value=False)
+    in_countries = codes >= 0
+    matches = np.bincount(codes[in_countries & is_value], minlength=len(countries))
+    others = np.bincount(codes[in_countries & ~is_value], minlength=len(countries))
+    
+    # Every pair's 2x2 table: [[a, b], [c, d]]
+    first, second = np.triu_indices(len(countries), k=1)
+    a, b = matches[first].astype(float), others[first].astype(float)
+    c, d = matches[second].astype(float), others[second].astype(float)
+    row1, row2, col1, col2 = a + b, c + d, a + c, b + d
+    total = row1 + row2
+    
+    insufficient = (col1 == 0) | (col2 == 0)
+    two_rows = (row1 > 0) & (row2 > 0) & ~insufficient
+    
+    # Closed-form chi-square with Yates' continuity correction
+    chi2 = np.zeros(len(first))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        deviation = np.maximum(np.abs(a * d - b * c) / total - 0.5, 0)
+        chi2[two_rows] = (deviation ** 2 * total ** 3 / (row1 * row2 * col1 * col2))[two_rows]
+    p_values = np.where(two_rows, stats.chi2.sf(chi2, 1), 1.0)
+    dof = two_rows.astype(int)
+    
+    chi2[insufficient] = np.nan
+    p_values[insufficient] = np.nan
+    significant = p_values < 0.05
+    
+    return pd.DataFrame({
+        'Country 1': np.asarray(countries, dtype=object)[first],
+        'Country 2': np.asarray(countries, dtype=object)[second],
+        'Chi-Square': np.round(chi2, 4),
+        'P-Value': np.round(p_values, 4),
+        'Degrees of Freedom': dof,
+        'Significant': significant,
+        'Interpretation': np.where(
+            insufficient,
+            'Insufficient data for statistical test',
+            np.where(significant, 'Significant', 'Not significant')
+        )
+    })
+
+
 def compare_multiple_questions(processor: SurveyDataProcessor,
                               question_columns: List[str],
                               countries: List[str],
@@ -348,67 +659,139 @@ def compare_multiple_questions(processor: SurveyDataProcessor,
     if processor.cleaned_data is None or processor.country_column is None:
         return pd.DataFrame()
     
-    comparison_data = []
+    df = processor.cleaned_data
+    country_col = processor.country_column
+    questions = [q for q in dict.fromkeys(question_columns) if q in df.columns]
     
-    for question in question_columns:
-        if question not in processor.cleaned_data.columns:
-            continue
-        
-        breakdown = calculate_nationality_percentage(
-            processor.cleaned_data,
-            processor.country_column,
-            question,
-            exclude_null=True,
-            exclude_not_applicable=True
-        )
-        
-        # Filter for specified countries
-        breakdown = breakdown[breakdown['Nationality'].isin(countries)].copy()
-        
-        if breakdown.empty:
-            continue
-        
-        # If focus_value specified, get percentage for that value
-        # Otherwise, sum all percentages (should be ~100%)
-        if focus_value:
-            for country in countries:
-                country_data = breakdown[
-                    (breakdown['Nationality'] == country) &
-                    (breakdown['Value'] == focus_value)
-                ]
-                pct = country_data['Percentage'].values[0] if len(country_data) > 0 else 0
-                comparison_data.append({
-                    'Question': question,
-                    'Country': country,
-                    'Percentage': round(pct, 2)
-                })
-        else:
-            # Sum percentages for each country (should be close to 100%)
-            for country in countries:
-                country_total = breakdown[breakdown['Nationality'] == country]['Percentage'].sum()
-                comparison_data.append({
-                    'Question': question,
-                    'Country': country,
-                    'Percentage': round(country_total, 2)
-                })
-    
-    if not comparison_data:
+    if not questions:
+        return pd.DataFrame()
+    
+    present = _present_countries(processor, countries)
+    if not present:
         return pd.DataFrame()
     
-    comparison_df = pd.DataFrame(comparison_data)
+    # Stack every question into one long (country, question, value) frame
+    country_mask = _cached_country_mask(processor, present)
+    long = df.loc[country_mask, [country_col] + questions].melt(
+        id_vars=country_col,
+        var_name='Question',
+        value_name='Value'
+    )
+    
+    # Drop nulls and 'Not applicable' answers, reusing the per-question masks
+    applicable = np.concatenate([
+        _cached_applicable_mask(processor, q)[country_mask] for q in questions
+    ])
+    long = long[long['Value'].notna().to_numpy() & applicable]
+    
+    if long.empty:
+        return pd.DataFrame()
     
-    # Pivot table
-    pivot_table = comparison_df.pivot_table(
-        index='Question',
-        columns='Country',
-        values='Percentage',
-        aggfunc='first',
+    # One grouped count for all questions, normalized within (question, country)
+    counts = long.groupby(['Question', country_col, 'Value'], observed=True, sort=False).size()
+    totals = counts.groupby(level=[0, 1], observed=True, sort=False).transform('sum')
+    percentages = (counts / totals * 100).round(2)
+    
+    # If focus_value specified, get percentage for that value
+    # Otherwise, sum all percentages (should be ~100%)
+    if focus_value:
+        is_focus = percentages.index.get_level_values('Value') == focus_value
+        percentages = percentages[is_focus].droplevel('Value')
+    else:
+        percentages = percentages.groupby(level=[0, 1], observed=True, sort=False).sum().round(2)
+    
+    # Pivot table: every answered question as a row, every requested country as a column
+    pivot_table = percentages.unstack(country_col, fill_value=0).reindex(
+        index=pd.Index(sorted(counts.index.unique('Question')), name='Question'),
+        columns=pd.Index(sorted(set(countries)), name='Country'),
         fill_value=0
     )
     
     return pivot_table
 
 
+def _compare_questions_chunk(data: pd.DataFrame,
+                             country_column: str,
+                             question_columns: List[str],
+                             countries: List[str],
+                             focus_value: Optional[str]) -> pd.DataFrame:
+    """
+    Worker for compare_multiple_questions_parallel(); runs in a separate process.
+    
+    Args:
+        data (pd.DataFrame): Country column plus the chunk's question columns
+        country_column (str): Name of country/nationality column
+        question_columns (List[str]): Question columns of this chunk
+        countries (List[str]): List of countries to compare
+        focus_value (str, optional): Value to compare, passed through
+    
+    Returns:
+        pd.DataFrame: compare_multiple_questions() result for the chunk
+    """
+    processor = SurveyDataProcessor()
+    processor.cleaned_data = data
+    processor.country_column = country_column
+    
+    return compare_multiple_questions(processor, question_columns, countries, focus_value)
+
+
+def compare_multiple_questions_parallel(processor: SurveyDataProcessor,
+                                        question_columns: List[str],
+                                        countries: List[str],
+                                        focus_value: Optional[str] = None,
+                                        max_workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    Compare multiple questions across countries, splitting the questions across processes.
+    
+    Each worker receives only the country column and its own chunk of question columns.
+    Falls back to compare_multiple_questions() when there is a single chunk.
+    
+    Args:
+        processor (SurveyDataProcessor): Processed survey data processor
+        question_columns (List[str]): List of question columns to compare
+        countries (List[str]): List of countries to compare
+        focus_value (str, optional): If specified, only compares this value. If None, sums all percentages
+        max_workers (int, optional): Number of worker processes. Defaults to the CPU count
+    
+    Returns:
+        pd.DataFrame: Comparison table with questions as rows and countries as columns
+    """
+    if processor.cleaned_data is None or processor.country_column is None:
+        return pd.DataFrame()
+    
+    df = processor.cleaned_data
+    country_col = processor.country_column
+    questions = [q for q in dict.fromkeys(question_columns) if q in df.columns]
+    
+    # Contiguous chunks, one per worker
+    n_workers = max(1, min(max_workers or os.cpu_count() or 1, len(questions)))
+    chunk_size = -(-len(questions) // n_workers) if questions else 1
+    chunks = [questions[i:i + chunk_size] for i in range(0, len(questions), chunk_size)]
+    
+    if len(chunks) <= 1:
+        return compare_multiple_questions(processor, questions, countries, focus_value)
+    
+    with ProcessPoolExecutor(max_workers=len(chunks)) as executor:
+        futures = [
+            executor.submit(
+                _compare_questions_chunk,
+                df[[country_col] + [q for q in chunk if q != country_col]],
+                country_col,
+                chunk,
+                countries,
+                focus_value
+            )
+            for chunk in chunks
+        ]
+        results = [future.result() for future in futures]
+    
+    results = [result for result in results if not result.empty]
+    if not results:
+        return pd.DataFrame()
+    
+    return pd.concat(results).sort_index()
+
+
 def calculate_ranking_comparison(processor: SurveyDataProcessor,
                                 question_column: str,
                                 countries: List[str],
@@ -428,28 +811,26 @@ def calculate_ranking_comparison(processor: SurveyDataProcessor,
     if processor.cleaned_data is None or processor.country_column is None:
         return pd.DataFrame()
     
-    # Calculate percentages
-    breakdown = calculate_nationality_percentage(
-        processor.cleaned_data,
-        processor.country_column,
-        question_column,
-        exclude_null=True
-    )
-    
-    # Filter for specified countries and value
-    filtered = breakdown[
-        (breakdown['Nationality'].isin(countries)) &
-        (breakdown['Value'] == value)
-    ].copy()
+    # Look up the rows for the requested countries and value
+    lookup = _cached_breakdown_lookup(processor, question_column, exclude_null=True)
+    positions = _lookup_positions(lookup, list(dict.fromkeys(countries)), value)
+    positions = np.sort(positions[positions >= 0])
     
-    if filtered.empty:
+    if len(positions) == 0:
         return pd.DataFrame()
     
-    # Sort by percentage
-    ranking = filtered.sort_values('Percentage', ascending=False).copy()
-    ranking['Rank'] = range(1, len(ranking) + 1)
-    
-    return ranking[['Rank', 'Nationality', 'Value', 'Count', 'Percentage']]
+    # Sort by percentage (ties keep breakdown order) and build the result once
+    order = np.argsort(-lookup['percentages'][positions], kind='stable')
+    rows = positions[order]
+    breakdown = lookup['breakdown']
+    
+    return pd.DataFrame({
+        'Rank': np.arange(1, len(rows) + 1),
+        'Nationality': breakdown['Nationality'].array.take(rows),
+        'Value': breakdown['Value'].array.take(rows),
+        'Count': breakdown['Count'].array.take(rows),
+        'Percentage': lookup['percentages'][rows]
+    }, index=breakdown.index[rows])
 
 
 def generate_comparison_report(processor: SurveyDataProcessor,
@@ -487,16 +868,21 @@ def generate_comparison_report(processor: SurveyDataProcessor,
     report.append(f"\nCountries compared: {', '.join(countries)}")
     report.append(f"\nTotal responses per country:")
     
+    # One count over the (categorical) country column instead of a full-frame
+    # boolean filter per country
+    country_counts = processor.get_nationality_counts()
     for country in countries:
-        count = len(processor.cleaned_data[
-            processor.cleaned_data[processor.country_column] == country
-        ])
+        count = int(country_counts.get(country, 0))
         report.append(f"  - {country}: {count}")
     
     report.append("\n" + "-" * 70)
     report.append("Percentage Distribution:")
     report.append("-" * 70)
-    report.append(comparison.to_string())
+    
+    # Write the table as tab-separated text; to_csv formats in C rather than per cell
+    table = io.StringIO()
+    comparison.to_csv(table, sep='\t', float_format='%.2f')
+    report.append(table.getvalue().rstrip('\n'))
     
     # Add top values for each country
     report.append("\n" + "-" * 70)
@@ -10,36 +10,39 @@ This module provides functionality to:
 - Remove test/invalid responses
 """
 
+import re
+from functools import lru_cache
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 
-# Standard country name mapping for normalization
+# Standard country name mapping for normalization (keys are stripped and lowercase,
+# matching how names are looked up)
 COUNTRY_MAPPING = {
     'india': 'India',
     'indian': 'India',
-    'india ': 'India',
-    'INDIA': 'India',
     'nigeria': 'Nigeria',
-    'nigeria ': 'Nigeria',
     'nigeria 🇳🇬': 'Nigeria',
-    'NIGERIA': 'Nigeria',
     'myanmar': 'Myanmar',
     'sri lanka': 'Sri Lanka',
     'bangladesh': 'Bangladesh',
     'pakistan': 'Pakistan',
-    'pakistan ': 'Pakistan',
     'iran': 'Iran',
-    'IRAN': 'Iran',
     'romania': 'Romania',
-    'ROMANIA': 'Romania',
     'czech republic': 'Czech Republic',
     'kenya': 'Kenya',
     'cyprus': 'Cyprus',
     'bahrain': 'Bahrain'
 }
 
+# Typos are only corrected in names at least this long, so short names one edit
+# away from a known country (e.g. 'iraq' vs 'iran') are left alone
+FUZZY_COUNTRY_MIN_LENGTH = 5
+
+# Anything other than letters and spaces (emoji flags, punctuation, digits)
+_NON_LETTER_RE = re.compile(r'[^a-z ]+')
+
 # Standardized rating scales
 IMPORTANCE_RATINGS = ['Not at all', 'A little', 'Moderately', 'Very', 'Extremely', 'Not applicable']
 AGREEMENT_RATINGS = ['Strongly disagree', 'Mildly disagree', 'Neither agree nor disagree', 
@@ -54,143 +57,230 @@ SATISFACTION_RATINGS = ['Very dissatisfied', 'Somewhat dissatisfied', 'Neither s
 IMPORTANCE_FAMILY_RATINGS = ['Not at all important', 'Somewhat important', 'Neutral', 
                              'Extremely important']
 
+# Lowercase -> canonical spellings used to normalize each rating type
+IMPORTANCE_MAP = {
+    'not at all': 'Not at all',
+    'a little': 'A little',
+    'moderately': 'Moderately',
+    'very': 'Very',
+    'extremely': 'Extremely',
+    'not applicable': 'Not applicable'
+}
+AGREEMENT_MAP = {
+    'strongly disagree': 'Strongly disagree',
+    'mildly disagree': 'Mildly disagree',
+    'disagree': 'Disagree',
+    'neither agree nor disagree': 'Neither agree nor disagree',
+    'neutral': 'Neutral',
+    'mildly agree': 'Mildly agree',
+    'agree': 'Agree',
+    'strongly agree': 'Strongly agree'
+}
+DIFFICULTY_MAP = {
+    'not at all': 'Not at all',
+    'slightly (a little)': 'Slightly (a little)',
+    'slightly': 'Slightly (a little)',
+    'moderately': 'Moderately',
+    'very': 'Very',
+    'extremely': 'Extremely',
+    'not applicable': 'Not applicable'
+}
+
+# Column names the country column is auto-detected from, in order of preference
+COUNTRY_COLUMN_NAMES = ['What is your home country? *', 'What is your home country?', 
+                        'Country', 'Home Country', 'Nationality']
+
+# Rating column detection: keyword in the column name, skipping quiz points/feedback columns
+_RATING_RE = re.compile(r'important|agree|difficult', re.IGNORECASE)
+_EXCLUDE_RE = re.compile(r'Points|Feedback')
+
+# Runs of whitespace inside column names
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Mapping used for each rating keyword, in the order they are applied
+_RATING_MAPS = {'important': IMPORTANCE_MAP, 'agree': AGREEMENT_MAP, 'difficult': DIFFICULTY_MAP}
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """
+    Check whether two strings differ by at most one insertion, deletion, substitution
+    or swap of adjacent characters.
+    
+    Args:
+        a (str): First string
+        b (str): Second string
+    
+    Returns:
+        bool: True if the strings are at most one edit apart
+    """
+    if abs(len(a) - len(b)) > 1:
+        return False
+    
+    # Skip the common prefix and compare what is left
+    i = 0
+    while i < len(a) and i < len(b) and a[i] == b[i]:
+        i += 1
+    a, b = a[i:], b[i:]
+    
+    return (a[1:] == b[1:] or a[1:] == b or a == b[1:]
+            or (len(a) == len(b) > 1 and a[0] == b[1] and a[1] == b[0] and a[2:] == b[2:]))
+
+
+@lru_cache(maxsize=1024)
+def _match_country(name: str) -> Optional[str]:
+    """
+    Find the canonical country for a stripped name, tolerating emoji/punctuation and one typo.
+    
+    Args:
+        name (str): Stripped country name as entered
+    
+    Returns:
+        Optional[str]: Canonical country name, or None if there is no unambiguous match
+    """
+    lowered = name.lower()
+    if lowered in COUNTRY_MAPPING:
+        return COUNTRY_MAPPING[lowered]
+    
+    # Drop flags, punctuation and repeated spaces (e.g. 'Nigeria 🇳🇬' -> 'nigeria')
+    key = ' '.join(_NON_LETTER_RE.sub(' ', lowered).split())
+    if key in COUNTRY_MAPPING:
+        return COUNTRY_MAPPING[key]
+    
+    if len(key) < FUZZY_COUNTRY_MIN_LENGTH:
+        return None
+    
+    # Correct a single typo (e.g. 'indai', 'nigera') only if it points to one country
+    matches = {country for spelling, country in COUNTRY_MAPPING.items()
+               if _within_one_edit(key, spelling)}
+    return matches.pop() if len(matches) == 1 else None
+
+
+def _normalize_distinct(series: pd.Series, mapping: Union[Dict[str, str], Callable[[str], Optional[str]]],
+                        title_case: bool = False) -> pd.Series:
+    """
+    Normalize values through a lowercase mapping, working on each distinct value once.
+    
+    Values are converted to stripped strings; those whose lowercase form is in the
+    mapping are replaced, the rest are kept (title-cased if requested). Missing values
+    stay missing.
+    
+    Args:
+        series (pd.Series): Values to normalize
+        mapping (Dict[str, str] or callable): Lowercase value -> canonical value, or a
+            function taking the stripped value and returning the canonical value or None
+        title_case (bool): Whether unmapped values are title-cased. Default False
+    
+    Returns:
+        pd.Series: Normalized values aligned with the input
+    """
+    codes, uniques = pd.factorize(series)
+    
+    # Object dtype keeps Python's str.strip/lower/title semantics
+    names = pd.Series(uniques, dtype=object).astype(str).astype(object).str.strip()
+    fallback = names.str.title() if title_case else names
+    keys = names if callable(mapping) else names.str.lower()
+    normalized = keys.map(mapping).fillna(fallback)
+    
+    # Broadcast back to the rows; the trailing None is picked by missing values (code -1)
+    lookup = np.append(normalized.to_numpy(dtype=object), None)
+    return pd.Series(lookup[codes], index=series.index).infer_objects()
+
+
+def _detect_country_column(columns) -> Optional[str]:
+    """
+    Find the country column among the usual survey column names.
+    
+    Args:
+        columns: Column names to search
+    
+    Returns:
+        Optional[str]: First matching column name, or None if there is none
+    """
+    for col in COUNTRY_COLUMN_NAMES:
+        if col in columns:
+            return col
+    return None
+
 
-def normalize_country_names(df: pd.DataFrame, country_column: str = None) -> pd.DataFrame:
+def normalize_country_names(df: pd.DataFrame, country_column: str = None,
+                            _copy: bool = True) -> pd.DataFrame:
     """
     Normalize and standardize country/nationality names in the dataframe.
     
     Args:
         df (pd.DataFrame): Dataframe with country column
         country_column (str, optional): Name of country column. If None, auto-detects
+        _copy (bool): Whether to work on a copy of df. If False, df is modified in place
     
     Returns:
         pd.DataFrame: Dataframe with normalized country names
     """
-    df_clean = df.copy()
+    df_clean = df.copy() if _copy else df
     
     # Auto-detect country column if not provided
     if country_column is None:
-        country_cols = ['What is your home country? *', 'What is your home country?', 
-                       'Country', 'Home Country', 'Nationality']
-        for col in country_cols:
-            if col in df_clean.columns:
-                country_column = col
-                break
+        country_column = _detect_country_column(df_clean.columns)
     
     if country_column and country_column in df_clean.columns:
-        # Normalize country names
-        def normalize_country(country):
-            if pd.isna(country):
-                return None
-            country_str = str(country).strip()
-            # Check mapping first
-            if country_str.lower() in COUNTRY_MAPPING:
-                return COUNTRY_MAPPING[country_str.lower()]
-            # Return title case if not in mapping
-            return country_str.title()
-        
-        df_clean[country_column] = df_clean[country_column].apply(normalize_country)
+        # Check mapping first (allowing for flags and single typos), return title case if no match
+        df_clean[country_column] = _normalize_distinct(
+            df_clean[country_column], _match_country, title_case=True
+        )
     
     return df_clean
 
 
-def clean_rating_responses(df: pd.DataFrame) -> pd.DataFrame:
+def clean_rating_responses(df: pd.DataFrame, _copy: bool = True) -> pd.DataFrame:
     """
     Normalize and standardize rating responses across the dataframe.
     
     Args:
         df (pd.DataFrame): Dataframe with rating columns
+        _copy (bool): Whether to work on a copy of df. If False, df is modified in place
     
     Returns:
         pd.DataFrame: Dataframe with normalized ratings
     """
-    df_clean = df.copy()
-    
-    # Helper function to normalize a rating value
-    def normalize_rating(value, rating_type='importance'):
-        if pd.isna(value):
-            return None
-        
-        value_str = str(value).strip()
-        
-        # Handle various rating types
-        if rating_type == 'importance':
-            mapping = {
-                'not at all': 'Not at all',
-                'not at all ': 'Not at all',
-                'a little': 'A little',
-                'a little ': 'A little',
-                'moderately': 'Moderately',
-                'moderately ': 'Moderately',
-                'very': 'Very',
-                'very ': 'Very',
-                'extremely': 'Extremely',
-                'extremely ': 'Extremely',
-                'not applicable': 'Not applicable',
-                'not applicable ': 'Not applicable'
-            }
-            return mapping.get(value_str.lower(), value_str)
-        
-        elif rating_type == 'agreement':
-            mapping = {
-                'strongly disagree': 'Strongly disagree',
-                'mildly disagree': 'Mildly disagree',
-                'disagree': 'Disagree',
-                'neither agree nor disagree': 'Neither agree nor disagree',
-                'neutral': 'Neutral',
-                'mildly agree': 'Mildly agree',
-                'agree': 'Agree',
-                'strongly agree': 'Strongly agree'
-            }
-            return mapping.get(value_str.lower(), value_str)
-        
-        elif rating_type == 'difficulty':
-            mapping = {
-                'not at all': 'Not at all',
-                'slightly (a little)': 'Slightly (a little)',
-                'slightly': 'Slightly (a little)',
-                'moderately': 'Moderately',
-                'very': 'Very',
-                'extremely': 'Extremely',
-                'not applicable': 'Not applicable'
-            }
-            return mapping.get(value_str.lower(), value_str)
-        
-        return value_str
+    df_clean = df.copy() if _copy else df
     
-    # Identify rating columns by keywords
-    importance_cols = [col for col in df_clean.columns if 'important' in col.lower() and 
-                      'Points' not in col and 'Feedback' not in col]
-    agreement_cols = [col for col in df_clean.columns if 'agree' in col.lower() and 
-                     'Points' not in col and 'Feedback' not in col]
-    difficulty_cols = [col for col in df_clean.columns if 'difficult' in col.lower() and 
-                      'Points' not in col and 'Feedback' not in col]
+    # Identify rating columns by keywords in one pass (a column may match several)
+    rating_cols = {'important': [], 'agree': [], 'difficult': []}
+    for col in df_clean.columns:
+        if _EXCLUDE_RE.search(col):
+            continue
+        for keyword in dict.fromkeys(match.lower() for match in _RATING_RE.findall(col)):
+            rating_cols[keyword].append(col)
+    importance_cols = rating_cols['important']
+    agreement_cols = rating_cols['agree']
+    difficulty_cols = rating_cols['difficult']
     
     # Normalize importance ratings
     for col in importance_cols:
         if col in df_clean.columns:
-            df_clean[col] = df_clean[col].apply(lambda x: normalize_rating(x, 'importance'))
+            df_clean[col] = _normalize_distinct(df_clean[col], IMPORTANCE_MAP)
     
     # Normalize agreement ratings
     for col in agreement_cols:
         if col in df_clean.columns:
-            df_clean[col] = df_clean[col].apply(lambda x: normalize_rating(x, 'agreement'))
+            df_clean[col] = _normalize_distinct(df_clean[col], AGREEMENT_MAP)
     
     # Normalize difficulty ratings
     for col in difficulty_cols:
         if col in df_clean.columns:
-            df_clean[col] = df_clean[col].apply(lambda x: normalize_rating(x, 'difficulty'))
+            df_clean[col] = _normalize_distinct(df_clean[col], DIFFICULTY_MAP)
     
     return df_clean
 
 
-def remove_empty_rows(df: pd.DataFrame, threshold: float = 0.8) -> pd.DataFrame:
+def remove_empty_rows(df: pd.DataFrame, threshold: float = 0.8, _copy: bool = True) -> pd.DataFrame:
     """
     Remove rows that are mostly empty (above threshold percentage of missing values).
     
     Args:
         df (pd.DataFrame): Dataframe to clean
         threshold (float): Percentage threshold (0-1). Rows with more than this % missing are removed
+        _copy (bool): Whether to return an independent copy. If False, the filtered frame
+            is returned as is
     
     Returns:
         pd.DataFrame: Dataframe with empty rows removed
@@ -198,66 +288,118 @@ def remove_empty_rows(df: pd.DataFrame, threshold: float = 0.8) -> pd.DataFrame:
     if df.empty:
         return df
     
-    # Calculate missing percentage per row
-    missing_pct = df.isnull().sum(axis=1) / len(df.columns)
+    # Count missing values per row one column at a time, so the full
+    # boolean matrix of the frame is never materialized
+    missing_counts = np.zeros(len(df), dtype=np.intp)
+    for i in range(df.shape[1]):
+        missing_counts += df.iloc[:, i].isna().to_numpy()
+    missing_pct = missing_counts / df.shape[1]
     
-    # Keep rows below threshold
+    # Keep rows below threshold (positional, so no index alignment)
     mask = missing_pct < threshold
-    df_clean = df[mask].copy()
+    df_clean = df.iloc[mask].copy() if _copy else df.iloc[mask]
     
     return df_clean
 
 
-def remove_test_responses(df: pd.DataFrame, country_column: str = None) -> pd.DataFrame:
+def remove_test_responses(df: pd.DataFrame, country_column: str = None,
+                          _copy: bool = True) -> pd.DataFrame:
     """
     Remove test responses and invalid entries.
     
     Args:
         df (pd.DataFrame): Dataframe to clean
         country_column (str, optional): Country column name for filtering
+        _copy (bool): Whether to return an independent copy. If False, the filtered frame
+            (or df itself when nothing is filtered) is returned as is
     
     Returns:
         pd.DataFrame: Dataframe with test responses removed
     """
-    df_clean = df.copy()
+    if not country_column or country_column not in df.columns:
+        return df.copy() if _copy else df
     
-    # Remove rows with empty country if country column exists
-    if country_column and country_column in df_clean.columns:
-        df_clean = df_clean[df_clean[country_column].notna()].copy()
+    # Remove rows with empty country, including empty or blank strings, in one filter
+    # (a blank string strips to '', so this also covers exact empty strings)
+    countries = df[country_column]
+    mask = countries.notna() & (countries.str.strip() != '')
+    df_clean = df.loc[mask]
     
-    # Remove rows where country is empty string
-    if country_column and country_column in df_clean.columns:
-        df_clean = df_clean[df_clean[country_column] != ''].copy()
-        df_clean = df_clean[df_clean[country_column].str.strip() != ''].copy()
+    return df_clean.copy() if _copy else df_clean
+
+
+def clean_column_name(name: str) -> str:
+    """
+    Clean a single column name: collapse whitespace runs to one space and trim the ends.
     
-    return df_clean
+    Args:
+        name (str): Column name
+    
+    Returns:
+        str: Cleaned column name
+    """
+    return _WHITESPACE_RE.sub(' ', name).strip()
 
 
-def clean_column_names(df: pd.DataFrame) -> pd.DataFrame:
+def clean_column_names(df: pd.DataFrame, _copy: bool = True) -> pd.DataFrame:
     """
     Clean and normalize column names.
     
     Args:
         df (pd.DataFrame): Dataframe with columns to clean
+        _copy (bool): Whether to work on a copy of df. If False, df is renamed in place
     
     Returns:
         pd.DataFrame: Dataframe with cleaned column names
     """
-    df_clean = df.copy()
+    df_clean = df.copy() if _copy else df
     
-    # Create mapping of old to new column names
-    column_mapping = {}
+    # Map old to new column names: collapse whitespace runs to one space, then trim the ends
+    column_mapping = {col: clean_column_name(col) for col in df_clean.columns}
     
-    for col in df_clean.columns:
-        new_col = col
-        # Remove trailing/leading whitespace
-        new_col = new_col.strip()
-        # Replace multiple spaces with single space
-        new_col = ' '.join(new_col.split())
-        column_mapping[col] = new_col
+    df_clean.rename(columns=column_mapping, inplace=True)
+    
+    return df_clean
+
+
+def _clean_columns(df: pd.DataFrame, normalize_countries: bool = True,
+                   normalize_ratings: bool = True, country_column: str = None) -> pd.DataFrame:
+    """
+    Clean column names and normalize country and rating columns in a single pass over the columns.
     
-    df_clean = df_clean.rename(columns=column_mapping)
+    Gives the same result as clean_column_names followed by normalize_country_names and
+    clean_rating_responses, but builds each output column once and the frame once.
+    
+    Args:
+        df (pd.DataFrame): Raw survey data
+        normalize_countries (bool): Whether to normalize country names. Default True
+        normalize_ratings (bool): Whether to normalize rating scales. Default True
+        country_column (str, optional): Country column name (after cleaning). If None, auto-detects
     
+    Returns:
+        pd.DataFrame: New dataframe with cleaned names and normalized values
+    """
+    names = [clean_column_name(col) for col in df.columns]
+    if normalize_countries and country_column is None:
+        country_column = _detect_country_column(names)
+    
+    columns = {}
+    for i, name in enumerate(names):
+        series = df.iloc[:, i]
+        
+        if normalize_countries and name == country_column:
+            series = _normalize_distinct(series, _match_country, title_case=True)
+        
+        if normalize_ratings and not _EXCLUDE_RE.search(name):
+            keywords = {match.lower() for match in _RATING_RE.findall(name)}
+            for keyword, mapping in _RATING_MAPS.items():
+                if keyword in keywords:
+                    series = _normalize_distinct(series, mapping)
+        
+        columns[i] = series
+    
+    df_clean = pd.DataFrame(columns, index=df.index)
+    df_clean.columns = names
     return df_clean
 
 
@@ -281,8 +423,11 @@ def clean_survey_data(df: pd.DataFrame,
     Returns:
         Tuple[pd.DataFrame, Dict]: Cleaned dataframe and cleaning statistics
     """
-    df_clean = df.copy()
-    original_rows = len(df_clean)
+    original_rows = len(df)
+    
+    # Column names are cleaned first, so refer to the country column by its cleaned name
+    if country_column is not None:
+        country_column = clean_column_name(country_column)
     
     cleaning_stats = {
         'original_rows': original_rows,
@@ -290,24 +435,19 @@ def clean_survey_data(df: pd.DataFrame,
         'operations_performed': []
     }
     
-    # Clean column names
-    df_clean = clean_column_names(df_clean)
+    # Clean column names and normalize countries/ratings in one pass; this builds a new
+    # frame, so the row removal steps below can work on it without copying again
+    df_clean = _clean_columns(df, normalize_countries, normalize_ratings, country_column)
     cleaning_stats['operations_performed'].append('Column names cleaned')
-    
-    # Normalize countries
     if normalize_countries:
-        df_clean = normalize_country_names(df_clean, country_column)
         cleaning_stats['operations_performed'].append('Country names normalized')
-    
-    # Normalize ratings
     if normalize_ratings:
-        df_clean = clean_rating_responses(df_clean)
         cleaning_stats['operations_performed'].append('Rating responses normalized')
     
     # Remove empty rows
     if remove_empty:
         rows_before = len(df_clean)
-        df_clean = remove_empty_rows(df_clean, threshold=0.8)
+        df_clean = remove_empty_rows(df_clean, threshold=0.8, _copy=False)
         rows_removed = rows_before - len(df_clean)
         cleaning_stats['rows_removed'] += rows_removed
         if rows_removed > 0:
@@ -316,7 +456,7 @@ def clean_survey_data(df: pd.DataFrame,
     # Remove test responses
     if remove_tests:
         rows_before = len(df_clean)
-        df_clean = remove_test_responses(df_clean, country_column)
+        df_clean = remove_test_responses(df_clean, country_column, _copy=False)
         rows_removed = rows_before - len(df_clean)
         cleaning_stats['rows_removed'] += rows_removed
         if rows_removed > 0:
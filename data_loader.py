@@ -10,12 +10,79 @@ This module provides functionality to:
 - Return pandas DataFrames for further processing
 """
 
+import io
 import pandas as pd
 import os
 from typing import Union, Optional
 import streamlit as st
 
 
+def _read_csv(source, encoding: str = 'utf-8') -> pd.DataFrame:
+    """
+    Read CSV data using the multithreaded pyarrow parser when it is available.
+    
+    Args:
+        source: File path or file-like object containing CSV data
+        encoding (str): File encoding. Defaults to 'utf-8'
+    
+    Returns:
+        pd.DataFrame: Loaded data as a pandas DataFrame
+    
+    Raises:
+        UnicodeDecodeError: If the data cannot be decoded with the given encoding
+    """
+    try:
+        df = pd.read_csv(source, encoding=encoding, engine='pyarrow')
+    except ImportError:
+        return pd.read_csv(source, encoding=encoding)
+    
+    # pyarrow keeps undecodable text as raw bytes instead of raising
+    for col in df.columns[df.dtypes == object]:
+        if df[col].map(type).eq(bytes).any():
+            raise UnicodeDecodeError(encoding, b'', 0, 1, f"invalid data in column '{col}'")
+    
+    return df
+
+
+def _optimize_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Downcast integer columns to the smallest integer type that holds their values.
+    
+    The conversion is lossless. Float columns are left as float64 so statistics keep
+    full precision, and text columns are converted to categoricals later by the
+    processor, after cleaning.
+    
+    Args:
+        df (pd.DataFrame): Loaded data
+    
+    Returns:
+        pd.DataFrame: The same dataframe with downcast integer columns
+    """
+    for col in df.select_dtypes('integer').columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    return df
+
+
+def _read_excel(source, sheet_name: Optional[Union[str, int]] = 0) -> pd.DataFrame:
+    """
+    Read Excel data using the calamine engine when it is available, falling back to openpyxl.
+    
+    Args:
+        source: File path or file-like object containing Excel data
+        sheet_name (str or int, optional): Name or index of sheet to load. Defaults to 0 (first sheet)
+    
+    Returns:
+        pd.DataFrame: Loaded data as a pandas DataFrame
+    """
+    try:
+        return pd.read_excel(source, sheet_name=sheet_name, engine='calamine')
+    except (ImportError, ValueError):
+        # python-calamine is not installed (or this pandas predates the engine)
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        return pd.read_excel(source, sheet_name=sheet_name, engine='openpyxl')
+
+
 def load_excel_file(file_path: str, sheet_name: Optional[Union[str, int]] = 0) -> pd.DataFrame:
     """
     Load an Excel file and return a pandas DataFrame.
@@ -35,7 +102,7 @@ def load_excel_file(file_path: str, sheet_name: Optional[Union[str, int]] = 0) -
         raise FileNotFoundError(f"File not found: {file_path}")
     
     try:
-        df = pd.read_excel(file_path, sheet_name=sheet_name, engine='openpyxl')
+        df = _read_excel(file_path, sheet_name=sheet_name)
         return df
     except Exception as e:
         raise ValueError(f"Error reading Excel file: {str(e)}")
@@ -62,9 +129,9 @@ def load_csv_file(file_path: str, encoding: str = 'utf-8') -> pd.DataFrame:
     try:
         # Try UTF-8 first, fall back to latin-1 if needed
         try:
-            df = pd.read_csv(file_path, encoding=encoding)
+            df = _read_csv(file_path, encoding=encoding)
         except UnicodeDecodeError:
-            df = pd.read_csv(file_path, encoding='latin-1')
+            df = _read_csv(file_path, encoding='latin-1')
         return df
     except Exception as e:
         raise ValueError(f"Error reading CSV file: {str(e)}")
@@ -91,13 +158,39 @@ def load_survey_data(file_path: str, sheet_name: Optional[Union[str, int]] = Non
     file_extension = os.path.splitext(file_path)[1].lower()
     
     if file_extension == '.xlsx':
-        return load_excel_file(file_path, sheet_name)
+        df = load_excel_file(file_path, sheet_name)
+        return _optimize_dtypes(df) if isinstance(df, pd.DataFrame) else df
     elif file_extension == '.csv':
-        return load_csv_file(file_path)
+        return _optimize_dtypes(load_csv_file(file_path))
     else:
         raise ValueError(f"Unsupported file format: {file_extension}. Supported formats: .xlsx, .csv")
 
 
+@st.cache_data(show_spinner=False, max_entries=4)
+def _parse_upload(name: str, data: bytes) -> pd.DataFrame:
+    """
+    Parse the contents of an uploaded file, cached on its name and bytes so reruns reuse the result.
+    
+    Args:
+        name (str): Uploaded file name, used to detect the format
+        data (bytes): Raw file contents
+    
+    Returns:
+        pd.DataFrame: Loaded survey data
+    
+    Raises:
+        ValueError: If file format is not supported
+    """
+    file_extension = os.path.splitext(name)[1].lower()
+    
+    if file_extension == '.xlsx':
+        return _read_excel(io.BytesIO(data))
+    elif file_extension == '.csv':
+        return _read_csv(io.BytesIO(data), encoding='utf-8')
+    else:
+        raise ValueError(f"Unsupported file format: {file_extension}. Supported: .xlsx, .csv")
+
+
 def load_survey_data_from_upload(uploaded_file) -> pd.DataFrame:
     """
     Load survey data from a Streamlit uploaded file object.
@@ -111,17 +204,9 @@ def load_survey_data_from_upload(uploaded_file) -> pd.DataFrame:
     Raises:
         ValueError: If file format is not supported
     """
-    file_extension = os.path.splitext(uploaded_file.name)[1].lower()
-    
     try:
-        if file_extension == '.xlsx':
-            df = pd.read_excel(uploaded_file, engine='openpyxl')
-        elif file_extension == '.csv':
-            df = pd.read_csv(uploaded_file, encoding='utf-8')
-        else:
-            raise ValueError(f"Unsupported file format: {file_extension}. Supported: .xlsx, .csv")
-        
-        return df
+        df = _parse_upload(uploaded_file.name, uploaded_file.getvalue())
+        return _optimize_dtypes(df)
     except Exception as e:
         raise ValueError(f"Error reading uploaded file: {str(e)}")
 
@@ -141,9 +226,10 @@ def validate_loaded_data(df: pd.DataFrame) -> dict:
             - 'missing_columns' (list): List of expected columns that are missing
             - 'issues' (list): List of validation issues found
     """
+    row_count = len(df)
     validation_result = {
         'valid': True,
-        'row_count': len(df),
+        'row_count': row_count,
         'column_count': len(df.columns),
         'missing_columns': [],
         'issues': []
@@ -170,13 +256,13 @@ def validate_loaded_data(df: pd.DataFrame) -> dict:
         # Don't fail validation, but note the issue
     
     # Check for minimum row count (at least 1 data row after header)
-    if validation_result['row_count'] < 1:
+    if row_count < 1:
         validation_result['valid'] = False
         validation_result['issues'].append("No data rows found")
     
     # Check for excessive missing values in key columns
     if country_col and country_col in df.columns:
-        missing_country_pct = df[country_col].isna().sum() / len(df) * 100
+        missing_country_pct = float(df[country_col].isna().to_numpy().mean()) * 100
         if missing_country_pct > 50:
             validation_result['issues'].append(f"High percentage ({missing_country_pct:.1f}%) of missing country data")
     
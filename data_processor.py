@@ -10,25 +10,120 @@ This module provides:
 - Data structure setup for visualization
 """
 
+import re
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Tuple, Union
 from data_loader import load_survey_data, load_survey_data_from_upload, validate_loaded_data
-from data_cleaner import clean_survey_data
+from data_cleaner import COUNTRY_COLUMN_NAMES, clean_column_name, clean_survey_data
+
+
+# Text answer columns with fewer distinct values than this are stored as categoricals
+CATEGORICAL_MAX_UNIQUE = 50
+
+# Number of per-question percentage breakdowns memoized on each processor
+BREAKDOWN_CACHE_SIZE = 64
+
+# Substrings marking quiz metadata columns (points, feedback, timestamps, ids) rather than questions
+META_COLUMN_TOKENS = ('Points', 'Feedback', 'Id', 'Start time', 'Completion time',
+                      'Total points', 'Quiz feedback', 'Grade posted time')
+_META_COLUMN_RE = re.compile('|'.join(map(re.escape, META_COLUMN_TOKENS)))
+
+# Keywords in a question's text that identify its rating scale, checked in order
+RATING_KIND_KEYWORDS = ('important', 'agree', 'difficult')
+
+
+def detect_rating_kind(column: str) -> Optional[str]:
+    """
+    Detect which rating scale a question uses from its column name.
+    
+    Args:
+        column (str): Question column name
+    
+    Returns:
+        str or None: First matching keyword of RATING_KIND_KEYWORDS, or None
+    """
+    col_lower = str(column).lower()
+    return next((kind for kind in RATING_KIND_KEYWORDS if kind in col_lower), None)
+
+
+# Shared result of get_nationality_counts when there is no data; like the cached counts,
+# it must not be modified in place
+_EMPTY_COUNTS = pd.Series(dtype=int)
+
+
+def _sorted_codes(series: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+    """
+    Encode a column as integer codes into its sorted distinct values.
+    
+    Categorical columns reuse their codes and categories; other columns are factorized.
+    
+    Args:
+        series (pd.Series): Column to encode
+    
+    Returns:
+        Tuple[np.ndarray, pd.Index]: Codes (-1 for missing values) and the values they refer to
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), series.cat.categories
+    
+    codes, uniques = pd.factorize(series, sort=True)
+    return codes, pd.Index(uniques)
 
 
 class SurveyDataProcessor:
     """
     Main class for processing survey data.
     Handles loading, cleaning, and structuring survey responses.
+    
+    Counts, masks and breakdowns derived from cleaned_data are cached and keyed on a
+    generation counter that advances whenever cleaned_data is assigned. The frame must
+    not be modified in place; after an in-place edit, assign it back
+    (processor.cleaned_data = df) so cached results are recomputed.
     """
     
     def __init__(self):
         self.raw_data: Optional[pd.DataFrame] = None
-        self.cleaned_data: Optional[pd.DataFrame] = None
+        self._raw_row_count: int = 0
+        self._cleaned_data: Optional[pd.DataFrame] = None
+        self._generation: int = 0
         self.country_column: Optional[str] = None
         self.cleaning_stats: Optional[Dict] = None
         self.processing_errors: List[str] = []
+        self.unique_values: Dict[str, List[str]] = {}
+        self.fingerprint: Optional[int] = None
+        self._rating_kind: Dict[str, Optional[str]] = {}
+        self._breakdown_cache: Dict[Tuple, Dict] = {}
+        self._applicable_masks: Dict[Tuple, np.ndarray] = {}
+        self._country_masks: Dict[Tuple, np.ndarray] = {}
+        self._nationality_counts: Dict[Tuple, pd.Series] = {}
+        self._countries: Dict[Tuple, List[str]] = {}
+        self._question_columns: Dict[Tuple, List[str]] = {}
+    
+    @property
+    def cleaned_data(self) -> Optional[pd.DataFrame]:
+        """Cleaned survey data (treat as read-only; see the class docstring)."""
+        return self._cleaned_data
+    
+    @cleaned_data.setter
+    def cleaned_data(self, data: Optional[pd.DataFrame]):
+        self._cleaned_data = data
+        self._reset_caches()
+    
+    def _reset_caches(self):
+        """
+        Drop breakdowns, masks and lookups computed on previously loaded or cleaned data.
+        
+        This is the only invalidation point: it also advances the generation counter
+        that every cache key starts with.
+        """
+        self._generation += 1
+        self._breakdown_cache = {}
+        self._applicable_masks = {}
+        self._country_masks = {}
+        self._nationality_counts = {}
+        self._countries = {}
+        self._question_columns = {}
     
     def load_data(self, file_path: Optional[str] = None, uploaded_file=None) -> bool:
         """
@@ -51,6 +146,10 @@ class SurveyDataProcessor:
                 self.processing_errors.append("No file path or uploaded file provided")
                 return False
             
+            # Results derived from any earlier data are no longer valid
+            self._reset_caches()
+            self._raw_row_count = len(self.raw_data)
+            
             # Auto-detect country column
             self._detect_country_column()
             
@@ -71,17 +170,16 @@ class SurveyDataProcessor:
         if self.raw_data is None:
             return
         
-        country_column_names = ['What is your home country? *', 'What is your home country?', 
-                               'Country', 'Home Country', 'Nationality']
-        
-        for col in country_column_names:
-            if col in self.raw_data.columns:
+        columns = self.raw_data.columns
+        for col in COUNTRY_COLUMN_NAMES:
+            if col in columns:
                 self.country_column = col
                 return
         
-        # If not found, check for columns containing 'country'
-        for col in self.raw_data.columns:
-            if 'country' in col.lower() and 'points' not in col.lower() and 'feedback' not in col.lower():
+        # If not found, check for columns containing 'country' (lowercasing each name once)
+        for col in columns:
+            col_lower = col.lower()
+            if 'country' in col_lower and 'points' not in col_lower and 'feedback' not in col_lower:
                 self.country_column = col
                 return
     
@@ -89,7 +187,8 @@ class SurveyDataProcessor:
                    normalize_countries: bool = True,
                    normalize_ratings: bool = True,
                    remove_empty: bool = True,
-                   remove_tests: bool = True) -> bool:
+                   remove_tests: bool = True,
+                   keep_raw: bool = True) -> bool:
         """
         Clean the loaded survey data.
         
@@ -98,6 +197,8 @@ class SurveyDataProcessor:
             normalize_ratings (bool): Normalize rating scales
             remove_empty (bool): Remove mostly empty rows
             remove_tests (bool): Remove test responses
+            keep_raw (bool): Keep raw_data after successful cleaning. If False it is released
+                to save memory, and the data must be loaded again before re-cleaning
         
         Returns:
             bool: True if cleaning successful, False otherwise
@@ -107,6 +208,7 @@ class SurveyDataProcessor:
             return False
         
         try:
+            # Assigning cleaned_data also resets the caches derived from earlier data
             self.cleaned_data, self.cleaning_stats = clean_survey_data(
                 self.raw_data,
                 normalize_countries=normalize_countries,
@@ -116,8 +218,28 @@ class SurveyDataProcessor:
                 country_column=self.country_column
             )
             
-            # Update country column if it was renamed
-            self._detect_country_column()
+            # Update country column if it was renamed; cleaning only normalizes whitespace
+            # in names, so map the detected name instead of scanning the columns again
+            if self.country_column is not None:
+                self.country_column = clean_column_name(self.country_column)
+            
+            # Question/metadata split and rating scale of every column, in one pass over the names
+            self._classify_columns()
+            
+            # Encode grouping columns as categoricals for faster groupby/filtering
+            self._convert_categorical_columns()
+            
+            # Remaining plain-text columns use Arrow-backed strings instead of object arrays
+            self._convert_string_columns()
+            
+            # Answer options per question, so the UI does not rescan columns on every rerun
+            self._build_unique_values()
+            
+            # Cheap identity for the cleaned data, used as a cache key by the app
+            self.fingerprint = self._compute_fingerprint()
+            
+            if not keep_raw:
+                self.raw_data = None
             
             return True
             
@@ -125,10 +247,115 @@ class SurveyDataProcessor:
             self.processing_errors.append(f"Error cleaning data: {str(e)}")
             return False
     
+    def _question_columns_key(self) -> Tuple:
+        """Cache key of the question columns of the current cleaned data."""
+        # The generation changes on every cleaned_data assignment; the column count also
+        # catches columns added to the frame in place
+        return (self._generation, len(self.cleaned_data.columns))
+    
+    def _classify_columns(self):
+        """
+        Classify every cleaned column in a single pass over the column names.
+        
+        Fills the question column cache read by get_question_columns and the rating
+        scale of each column used by the comparisons.
+        """
+        question_cols = []
+        self._rating_kind = {}
+        
+        for col in self.cleaned_data.columns:
+            self._rating_kind[col] = detect_rating_kind(col)
+            if not _META_COLUMN_RE.search(col):
+                question_cols.append(col)
+        
+        self._question_columns[self._question_columns_key()] = question_cols
+    
+    def _convert_categorical_columns(self):
+        """
+        Convert the country column and low-cardinality answer columns to categoricals.
+        
+        Groupby and filtering on categoricals work on small integer codes instead of
+        hashing every string, which speeds up all downstream percentage calculations.
+        """
+        if self.cleaned_data is None:
+            return
+        
+        if self.country_column and self.country_column in self.cleaned_data.columns:
+            self.cleaned_data[self.country_column] = self.cleaned_data[self.country_column].astype('category')
+        
+        for col in self.get_question_columns():
+            series = self.cleaned_data[col]
+            is_text = series.dtype == object or isinstance(series.dtype, pd.StringDtype)
+            if is_text and series.nunique(dropna=True) < CATEGORICAL_MAX_UNIQUE:
+                self.cleaned_data[col] = series.astype('category')
+    
+    def _convert_string_columns(self):
+        """
+        Store remaining object columns that hold only strings as Arrow-backed strings.
+        
+        Arrow keeps the text in contiguous buffers rather than one Python object per
+        cell, which makes filtering and CSV export cheaper. Columns that are already
+        categorical or string typed are left as they are.
+        """
+        if self.cleaned_data is None:
+            return
+        
+        try:
+            arrow_string = pd.StringDtype('pyarrow')
+        except ImportError:
+            return
+        
+        for col in self.cleaned_data.columns:
+            series = self.cleaned_data[col]
+            if series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) == 'string':
+                self.cleaned_data[col] = series.astype(arrow_string)
+    
+    def _compute_fingerprint(self) -> Optional[int]:
+        """
+        Compute a content fingerprint of the cleaned data.
+        
+        Computed once after cleaning so callers can key caches on a single integer
+        instead of hashing the whole DataFrame on every lookup.
+        
+        Returns:
+            Optional[int]: Fingerprint of shape, columns and row contents, or None if no data
+        """
+        if self.cleaned_data is None:
+            return None
+        
+        row_hashes = pd.util.hash_pandas_object(self.cleaned_data, index=False)
+        return hash((
+            self.cleaned_data.shape,
+            tuple(self.cleaned_data.columns),
+            int(row_hashes.to_numpy().sum())
+        ))
+    
+    def _build_unique_values(self):
+        """
+        Precompute the sorted, non-empty answer values of every question column.
+        
+        Categorical columns read their categories directly instead of scanning rows.
+        """
+        self.unique_values = {}
+        if self.cleaned_data is None:
+            return
+        
+        for col in self.get_question_columns():
+            series = self.cleaned_data[col]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                values = series.cat.categories
+            else:
+                values = series.dropna().unique()
+            labels = np.asarray(values).astype(str)
+            labels = labels[np.char.str_len(np.char.strip(labels)) > 0]
+            self.unique_values[col] = np.unique(labels).tolist()
+    
     def get_countries(self) -> List[str]:
         """
         Get list of unique countries in the dataset.
         
+        The list is computed once per cleaned dataset; callers receive their own copy.
+        
         Returns:
             List[str]: Sorted list of unique countries
         """
@@ -138,23 +365,41 @@ class SurveyDataProcessor:
         if self.country_column not in self.cleaned_data.columns:
             return []
         
-        countries = self.cleaned_data[self.country_column].dropna().unique().tolist()
-        return sorted([c for c in countries if str(c).strip() != ''])
+        key = (self._generation, self.country_column)
+        countries = self._countries.get(key)
+        
+        if countries is None:
+            # Countries with responses, read from the cached counts instead of rescanning rows
+            counts = self.get_nationality_counts()
+            values = pd.Index(counts.index[counts.to_numpy() > 0])
+            is_blank = values.astype('string').str.strip() == ''
+            countries = sorted(values[~np.asarray(is_blank, dtype=bool)].tolist())
+            self._countries[key] = countries
+        
+        return list(countries)
     
     def get_nationality_counts(self) -> pd.Series:
         """
         Get count of responses by nationality.
         
+        The counts are computed once per cleaned dataset; the returned Series is shared
+        between callers and must not be modified in place.
+        
         Returns:
             pd.Series: Series with nationality as index and count as values
         """
-        if self.cleaned_data is None or self.country_column is None:
-            return pd.Series(dtype=int)
+        if (self.cleaned_data is None or self.country_column is None
+                or self.country_column not in self.cleaned_data.columns):
+            return _EMPTY_COUNTS
         
-        if self.country_column not in self.cleaned_data.columns:
-            return pd.Series(dtype=int)
+        key = (self._generation, self.country_column)
+        counts = self._nationality_counts.get(key)
+        
+        if counts is None:
+            counts = self.cleaned_data[self.country_column].value_counts()
+            self._nationality_counts[key] = counts
         
-        return self.cleaned_data[self.country_column].value_counts()
+        return counts
     
     def calculate_nationality_percentages(self, column: str, 
                                          exclude_null: bool = True) -> pd.DataFrame:
@@ -174,31 +419,44 @@ class SurveyDataProcessor:
         if column not in self.cleaned_data.columns:
             return pd.DataFrame()
         
-        # Group by country and column value
-        grouped = self.cleaned_data.groupby([self.country_column, column]).size().reset_index(name='count')
+        if column == self.country_column:
+            # Group by country and column value (null values form no group)
+            grouped = self.cleaned_data.groupby(
+                [self.country_column, column], observed=True
+            ).size()
+            nationalities = grouped.index.get_level_values(0)
+            values = grouped.index.get_level_values(1)
+            counts = grouped.to_numpy()
+        else:
+            # Count every (country, value) pair with one bincount over the combined codes,
+            # i.e. a dense country x value matrix; rows come out in sorted (category) order,
+            # as with a sorted groupby
+            country_codes, country_labels = _sorted_codes(self.cleaned_data[self.country_column])
+            value_codes, value_labels = _sorted_codes(self.cleaned_data[column])
+            n_values = len(value_labels)
+            answered = (country_codes >= 0) & (value_codes >= 0)
+            pair_counts = np.bincount(
+                country_codes[answered].astype(np.intp) * n_values + value_codes[answered],
+                minlength=len(country_labels) * n_values
+            )
+            pairs = np.flatnonzero(pair_counts)
+            nationalities = country_labels.take(pairs // n_values)
+            values = value_labels.take(pairs % n_values)
+            counts = pair_counts[pairs]
         
-        # Calculate percentages
-        country_totals = self.cleaned_data.groupby(self.country_column).size()
+        if len(counts) == 0:
+            return pd.DataFrame()
         
-        result_data = []
-        for _, row in grouped.iterrows():
-            country = row[self.country_column]
-            value = row[column]
-            
-            if exclude_null and pd.isna(value):
-                continue
-            
-            country_total = country_totals.get(country, 0)
-            percentage = (row['count'] / country_total * 100) if country_total > 0 else 0
-            
-            result_data.append({
-                'Nationality': country,
-                'Value': value,
-                'Count': row['count'],
-                'Percentage': round(percentage, 2)
-            })
+        # Calculate percentages against each country's total (the cached nationality
+        # counts), mapped once per row
+        totals = self.get_nationality_counts().reindex(nationalities).to_numpy()
         
-        return pd.DataFrame(result_data)
+        return pd.DataFrame({
+            'Nationality': nationalities.tolist(),
+            'Value': values.tolist(),
+            'Count': counts,
+            'Percentage': np.round(counts / totals * 100, 2)
+        })
     
     def calculate_rating_breakdown(self, rating_column: str) -> pd.DataFrame:
         """
@@ -219,24 +477,30 @@ class SurveyDataProcessor:
         Returns:
             Dict: Summary statistics including row counts, column counts, countries, etc.
         """
+        # Build the counts dict from plain lists (same keys and Python ints as Series.to_dict)
+        counts = self.get_nationality_counts()
+        country_counts = dict(zip(counts.index.tolist(), counts.to_numpy().tolist())) if self.country_column else {}
+        
         summary = {
-            'raw_rows': len(self.raw_data) if self.raw_data is not None else 0,
+            'raw_rows': self._raw_row_count,
             'cleaned_rows': len(self.cleaned_data) if self.cleaned_data is not None else 0,
             'columns': len(self.cleaned_data.columns) if self.cleaned_data is not None else 0,
             'countries': self.get_countries(),
-            'country_counts': self.get_nationality_counts().to_dict() if self.country_column else {},
+            'country_counts': country_counts,
             'errors': self.processing_errors.copy(),
             'cleaning_stats': self.cleaning_stats
         }
         
         return summary
     
-    def filter_by_countries(self, countries: List[str]) -> pd.DataFrame:
+    def filter_by_countries(self, countries: List[str], copy: bool = False) -> pd.DataFrame:
         """
         Filter data to include only specified countries.
         
         Args:
             countries (List[str]): List of country names to include
+            copy (bool): Whether to return an independent copy. Default False, in which case
+                the filtered frame should be treated as read-only
         
         Returns:
             pd.DataFrame: Filtered dataframe
@@ -247,12 +511,38 @@ class SurveyDataProcessor:
         if self.country_column not in self.cleaned_data.columns:
             return pd.DataFrame()
         
-        return self.cleaned_data[self.cleaned_data[self.country_column].isin(countries)].copy()
+        filtered = self.cleaned_data.iloc[self._country_mask(countries)]
+        return filtered.copy() if copy else filtered
+    
+    def _country_mask(self, countries: List[str]) -> np.ndarray:
+        """
+        Build the row filter for a list of countries.
+        
+        A categorical country column is matched on its integer codes, so no row value
+        is hashed; other dtypes fall back to Series.isin.
+        
+        Args:
+            countries (List[str]): Country names to include
+        
+        Returns:
+            np.ndarray: Boolean array aligned with cleaned_data, True for rows of the countries
+        """
+        series = self.cleaned_data[self.country_column]
+        if not isinstance(series.dtype, pd.CategoricalDtype):
+            return series.isin(countries).to_numpy(dtype=bool)
+        
+        wanted = pd.Index(list(countries), dtype=object)
+        codes = series.cat.categories.get_indexer_for(wanted)
+        # Unknown countries give -1, which only missing values may keep (missing rows have code -1)
+        codes = codes[(codes >= 0) | wanted.isna()]
+        return np.isin(series.cat.codes.to_numpy(), codes)
     
     def get_question_columns(self, exclude_meta: bool = True) -> List[str]:
         """
         Get list of question columns (excluding Points and Feedback columns).
         
+        The list is computed once per cleaned dataset; callers receive their own copy.
+        
         Args:
             exclude_meta (bool): Whether to exclude Points/Feedback columns
         
@@ -262,24 +552,30 @@ class SurveyDataProcessor:
         if self.cleaned_data is None:
             return []
         
-        if exclude_meta:
-            # Exclude columns with 'Points' or 'Feedback' in name
+        if not exclude_meta:
+            return list(self.cleaned_data.columns)
+        
+        key = self._question_columns_key()
+        question_cols = self._question_columns.get(key)
+        
+        if question_cols is None:
+            # Exclude columns with 'Points', 'Feedback' or another metadata token in the name
             question_cols = [col for col in self.cleaned_data.columns 
-                           if 'Points' not in col and 'Feedback' not in col 
-                           and 'Id' not in col and 'Start time' not in col 
-                           and 'Completion time' not in col and 'Total points' not in col
-                           and 'Quiz feedback' not in col and 'Grade posted time' not in col]
-            return question_cols
+                           if not _META_COLUMN_RE.search(col)]
+            self._question_columns[key] = question_cols
         
-        return list(self.cleaned_data.columns)
+        return list(question_cols)
     
-    def process_pipeline(self, file_path: Optional[str] = None, uploaded_file=None) -> bool:
+    def process_pipeline(self, file_path: Optional[str] = None, uploaded_file=None,
+                         keep_raw: bool = False) -> bool:
         """
         Complete processing pipeline: load and clean data.
         
         Args:
             file_path (str, optional): Path to data file
             uploaded_file: Streamlit uploaded file object
+            keep_raw (bool): Keep raw_data after cleaning. Default False, so only the
+                cleaned data stays in memory
         
         Returns:
             bool: True if processing successful, False otherwise
@@ -289,26 +585,28 @@ class SurveyDataProcessor:
             return False
         
         # Clean data
-        if not self.clean_data():
+        if not self.clean_data(keep_raw=keep_raw):
             return False
         
         return True
 
 
 # Convenience functions for quick processing
-def process_survey_data(file_path: Optional[str] = None, uploaded_file=None) -> SurveyDataProcessor:
+def process_survey_data(file_path: Optional[str] = None, uploaded_file=None,
+                        keep_raw: bool = False) -> SurveyDataProcessor:
     """
     Quick function to process survey data.
     
     Args:
         file_path (str, optional): Path to data file
         uploaded_file: Streamlit uploaded file object
+        keep_raw (bool): Keep the raw data on the processor after cleaning. Default False
     
     Returns:
         SurveyDataProcessor: Processed data processor object
     """
     processor = SurveyDataProcessor()
-    processor.process_pipeline(file_path, uploaded_file)
+    processor.process_pipeline(file_path, uploaded_file, keep_raw=keep_raw)
     return processor
 
 
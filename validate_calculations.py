@@ -18,13 +18,18 @@ from calculations import calculate_nationality_percentage, calculate_country_cou
 import os
 
 
+# Fields of each stored validation result, in tuple order
+RESULT_COLUMNS = ['test_name', 'expected', 'actual', 'difference', 'tolerance', 'passed']
+
+
 class ValidationReport:
     """
     Class to generate and store validation results.
     """
     
     def __init__(self):
-        self.results: List[Dict] = []
+        # One tuple per test, laid out as RESULT_COLUMNS
+        self.results: List[Tuple] = []
         self.total_tests: int = 0
         self.passed_tests: int = 0
         self.failed_tests: int = 0
@@ -46,14 +51,7 @@ class ValidationReport:
         
         difference = abs(expected - actual)
         
-        self.results.append({
-            'test_name': test_name,
-            'expected': expected,
-            'actual': actual,
-            'difference': difference,
-            'tolerance': tolerance,
-            'passed': passed
-        })
+        self.results.append((test_name, expected, actual, difference, tolerance, passed))
         
         self.total_tests += 1
         if passed:
@@ -61,6 +59,32 @@ class ValidationReport:
         else:
             self.failed_tests += 1
     
+    def add_results_bulk(self, test_names: List[str], expected: List[float], actual: List[float],
+                         tolerances: List[float], passed: Optional[List[bool]] = None):
+        """
+        Add many validation test results at once, comparing them in a single numpy pass.
+        
+        Args:
+            test_names (List[str]): Names of the tests
+            expected (List[float]): Expected values
+            actual (List[float]): Actual calculated values
+            tolerances (List[float]): Allowed difference of each test
+            passed (List[bool], optional): Whether each test passed. If None, calculated
+                from the differences and tolerances
+        """
+        differences = np.abs(np.asarray(expected, dtype=float) - np.asarray(actual, dtype=float))
+        if passed is None:
+            passed = differences <= np.asarray(tolerances, dtype=float)
+        passed = np.asarray(passed, dtype=bool)
+        
+        self.results.extend(zip(test_names, expected, actual, differences.tolist(),
+                                tolerances, passed.tolist()))
+        
+        n_passed = int(passed.sum())
+        self.total_tests += len(passed)
+        self.passed_tests += n_passed
+        self.failed_tests += len(passed) - n_passed
+    
     def print_report(self):
         """Print validation report."""
         print("\n" + "=" * 70)
@@ -72,7 +96,7 @@ class ValidationReport:
         print("\n" + "-" * 70)
         
         if self.results:
-            df = pd.DataFrame(self.results)
+            df = pd.DataFrame(self.results, columns=RESULT_COLUMNS)
             print("\nTest Results:")
             print(df.to_string(index=False))
         
@@ -113,8 +137,9 @@ def validate_country_counts(processor: SurveyDataProcessor,
         tolerance=1.0  # Allow 1 response difference
     )
     
-    # Validate each country count
+    # Validate each country count (looked up by country instead of filtering per country)
     actual_counts_dict = dict(zip(actual_counts['Nationality'], actual_counts['Count']))
+    actual_pct_dict = dict(zip(actual_counts['Nationality'], actual_counts['Percentage'].to_numpy()))
     
     for country, expected_count in expected_counts.items():
         actual_count = actual_counts_dict.get(country, 0)
@@ -127,45 +152,36 @@ def validate_country_counts(processor: SurveyDataProcessor,
         
         # Validate percentages
         expected_pct = (expected_count / total_responses) * 100
-        actual_pct = actual_counts[actual_counts['Nationality'] == country]['Percentage'].values
-        if len(actual_pct) > 0:
+        if country in actual_pct_dict:
             report.add_result(
                 f"Percentage - {country}",
                 expected_pct,
-                actual_pct[0],
+                actual_pct_dict[country],
                 tolerance=0.1  # Allow 0.1% difference
             )
     
     return report
 
 
-def validate_percentage_calculation(processor: SurveyDataProcessor,
-                                   question_column: str,
-                                   country: str,
-                                   value: str,
-                                   expected_percentage: float,
-                                   tolerance: float = 0.1) -> Tuple[bool, float]:
+def _percentage_lookup(processor: SurveyDataProcessor,
+                       question_column: str) -> Optional[Dict[Tuple, float]]:
     """
-    Validate percentage calculation for a specific question, country, and value.
+    Calculate the percentage breakdown of a question as a (country, value) lookup.
     
     Args:
         processor (SurveyDataProcessor): Processed survey data processor
         question_column (str): Column name to analyze
-        country (str): Country to check
-        value (str): Response value to check
-        expected_percentage (float): Expected percentage from Excel
-        tolerance (float): Allowed difference. Default 0.1 (0.1%)
     
     Returns:
-        Tuple[bool, float]: (passed, actual_percentage)
+        Optional[Dict[Tuple, float]]: Percentage per (country, value), or None if the
+            question cannot be analyzed
     """
     if processor.cleaned_data is None or processor.country_column is None:
-        return False, 0.0
+        return None
     
     if question_column not in processor.cleaned_data.columns:
-        return False, 0.0
+        return None
     
-    # Calculate actual percentage
     breakdown = calculate_nationality_percentage(
         processor.cleaned_data,
         processor.country_column,
@@ -173,21 +189,65 @@ def validate_percentage_calculation(processor: SurveyDataProcessor,
         exclude_null=True
     )
     
-    # Filter for specific country and value
-    filtered = breakdown[
-        (breakdown['Nationality'] == country) & 
-        (breakdown['Value'] == value)
-    ]
+    if breakdown.empty:
+        return {}
+    
+    # First row wins for a repeated (country, value) pair, as with a filter
+    lookup = {}
+    for key, pct in zip(zip(breakdown['Nationality'], breakdown['Value']),
+                        breakdown['Percentage'].to_numpy()):
+        lookup.setdefault(key, pct)
+    return lookup
+
+
+def _check_percentage(lookup: Optional[Dict[Tuple, float]], country: str, value: str,
+                      expected_percentage: float, tolerance: float) -> Tuple[bool, float]:
+    """
+    Compare an expected percentage with the one in a (country, value) lookup.
+    
+    Args:
+        lookup (Optional[Dict[Tuple, float]]): Result of _percentage_lookup
+        country (str): Country to check
+        value (str): Response value to check
+        expected_percentage (float): Expected percentage from Excel
+        tolerance (float): Allowed difference
     
-    if filtered.empty:
+    Returns:
+        Tuple[bool, float]: (passed, actual_percentage)
+    """
+    if not lookup or (country, value) not in lookup:
         return False, 0.0
     
-    actual_percentage = filtered['Percentage'].values[0]
+    actual_percentage = lookup[(country, value)]
     passed = abs(expected_percentage - actual_percentage) <= tolerance
     
     return passed, actual_percentage
 
 
+def validate_percentage_calculation(processor: SurveyDataProcessor,
+                                   question_column: str,
+                                   country: str,
+                                   value: str,
+                                   expected_percentage: float,
+                                   tolerance: float = 0.1) -> Tuple[bool, float]:
+    """
+    Validate percentage calculation for a specific question, country, and value.
+    
+    Args:
+        processor (SurveyDataProcessor): Processed survey data processor
+        question_column (str): Column name to analyze
+        country (str): Country to check
+        value (str): Response value to check
+        expected_percentage (float): Expected percentage from Excel
+        tolerance (float): Allowed difference. Default 0.1 (0.1%)
+    
+    Returns:
+        Tuple[bool, float]: (passed, actual_percentage)
+    """
+    lookup = _percentage_lookup(processor, question_column)
+    return _check_percentage(lookup, country, value, expected_percentage, tolerance)
+
+
 def validate_manual_excel_comparison(processor: SurveyDataProcessor,
                                     test_cases: List[Dict]) -> ValidationReport:
     """
@@ -207,6 +267,10 @@ def validate_manual_excel_comparison(processor: SurveyDataProcessor,
     """
     report = ValidationReport()
     
+    # Each question's breakdown is calculated once, however many test cases use it
+    lookups = {}
+    test_names, expected, actual, tolerances, passed = [], [], [], [], []
+    
     for i, test_case in enumerate(test_cases, 1):
         question = test_case.get('question')
         country = test_case.get('country')
@@ -214,23 +278,25 @@ def validate_manual_excel_comparison(processor: SurveyDataProcessor,
         expected_pct = test_case.get('expected_percentage')
         tolerance = test_case.get('tolerance', 0.1)
         
-        passed, actual_pct = validate_percentage_calculation(
-            processor,
-            question,
+        if question not in lookups:
+            lookups[question] = _percentage_lookup(processor, question)
+        
+        test_passed, actual_pct = _check_percentage(
+            lookups[question],
             country,
             value,
             expected_pct,
             tolerance
         )
         
-        test_name = f"Test {i}: {country} - {question} - {value}"
-        report.add_result(
-            test_name,
-            expected_pct,
-            actual_pct,
-            tolerance,
-            passed
-        )
+        test_names.append(f"Test {i}: {country} - {question} - {value}")
+        expected.append(expected_pct)
+        actual.append(actual_pct)
+        tolerances.append(tolerance)
+        passed.append(test_passed)
+    
+    # Record all results with one vectorized comparison
+    report.add_results_bulk(test_names, expected, actual, tolerances, passed)
     
     return report
 